@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
+import threading
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import datetime
@@ -195,8 +196,18 @@ class OandaBroker(BrokerClient):
         self.base_url = base_url
         self.env = env
 
-        self.session = requests.Session()
-        self.session.headers.update({"Authorization": f"Bearer {self.api_key}"})
+        # requests.Session is not thread-safe and run_tick places orders
+        # from worker threads, so each thread gets its own session
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({"Authorization": f"Bearer {self.api_key}"})
+            self._local.session = session
+        return session
 
     def _instrument(self, symbol: str) -> str:
         if symbol not in self.SYMBOL_MAP:
@@ -222,7 +233,7 @@ class OandaBroker(BrokerClient):
             resp = self.session.get(url, params=params, timeout=10)
             resp.raise_for_status()
         except Exception as e:
-            print(f"[OandaBroker] get_ohlc error for {symbol} {timeframe}: {e}")
+            logger.warning("[OandaBroker] get_ohlc error for %s %s: %s", symbol, timeframe, e)
             return []
 
         data = resp.json()
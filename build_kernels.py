@@ -0,0 +1,41 @@
+"""
+Ahead-of-time compile the numeric kernels with numba.pycc.
+
+    python build_kernels.py
+
+Writes the ``chaosfx_kernels`` extension module next to this file. When it
+is importable (PYTHONPATH=.), chaosfx.kernels uses it directly so the first
+tick after a deploy doesn't stall on JIT compilation. Without it the
+kernels fall back to @njit(cache=True) or plain Python.
+
+render.yaml runs this after installing requirements. numba.pycc is
+pending deprecation in numba, so its warning is silenced here; if the
+build ever fails the deploy still goes ahead on the JIT fallback.
+"""
+
+import os
+import warnings
+
+from numba.core.errors import NumbaPendingDeprecationWarning
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", NumbaPendingDeprecationWarning)
+    from numba.pycc import CC
+
+from chaosfx import kernels
+
+output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc = CC("chaosfx_kernels")
+cc.output_dir = output_dir
+
+cc.export("compute_features", "f8[:](f8[:], f8[:], f8[:], f8[:])")(
+    kernels._compute_features
+)
+cc.export("eval_patterns", "b1[:](f8[:], f8[:], f8[:], f8[:], f8[:])")(
+    kernels._eval_patterns
+)
+
+
+if __name__ == "__main__":
+    cc.compile()
@@ -0,0 +1,119 @@
+"""
+Candle types shared by the strategies.
+
+``CandleSeries`` is the struct-of-arrays form: UTC ``datetime64[ns]``
+timestamps and float64 OHLC columns, so indicators and level scans work on
+whole arrays instead of per-bar Candle objects.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(slots=True, frozen=True)
+class Candle:
+    timestamp: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+
+
+def timestamps_to_datetime64(stamps: List[Union[datetime, str]]) -> np.ndarray:
+    """
+    Datetimes -> naive-UTC ``datetime64[ns]`` array (microsecond precision).
+    Naive datetimes are taken as UTC. ISO-8601 strings, as some brokers
+    return, are parsed as UTC.
+    """
+    if any(isinstance(t, str) for t in stamps):
+        parsed = pd.to_datetime(stamps, utc=True, format="ISO8601").tz_localize(None)
+        return parsed.to_numpy(dtype="datetime64[ns]")
+    micros = np.fromiter(
+        (
+            round((t if t.tzinfo else t.replace(tzinfo=timezone.utc)).timestamp() * 1_000_000)
+            for t in stamps
+        ),
+        np.int64,
+        len(stamps),
+    )
+    return micros.astype("datetime64[us]").astype("datetime64[ns]")
+
+
+@dataclass(slots=True)
+class CandleSeries:
+    """
+    Struct-of-arrays candle series: UTC ``datetime64[ns]`` timestamps and
+    float64 OHLC columns. When built from Candle objects they are kept in
+    ``candles`` so helpers that hand candles back (swings, sweeps) return
+    the caller's own objects.
+    """
+    timestamps: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    candles: Optional[List[Candle]] = None
+    _ranges: Optional[np.ndarray] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _wick_ratios: Optional[tuple[np.ndarray, np.ndarray]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __len__(self) -> int:
+        return self.close.shape[0]
+
+    def ranges(self) -> np.ndarray:
+        """High - low of every candle, computed once per series."""
+        if self._ranges is None:
+            self._ranges = self.high - self.low
+        return self._ranges
+
+    def wick_ratios(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (upper, lower) wick as a fraction of each candle's range, computed
+        once per series. NaN for candles with no range, so every threshold
+        comparison on them is False.
+        """
+        if self._wick_ratios is None:
+            rng = self.ranges()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                upper = (self.high - np.maximum(self.open, self.close)) / rng
+                lower = (np.minimum(self.open, self.close) - self.low) / rng
+            no_range = ~(rng > 0)
+            upper[no_range] = np.nan
+            lower[no_range] = np.nan
+            self._wick_ratios = (upper, lower)
+        return self._wick_ratios
+
+    @classmethod
+    def from_candles(cls, candles: List[Candle]) -> "CandleSeries":
+        n = len(candles)
+        return cls(
+            timestamps=timestamps_to_datetime64([c.timestamp for c in candles]),
+            open=np.fromiter((c.open for c in candles), np.float64, n),
+            high=np.fromiter((c.high for c in candles), np.float64, n),
+            low=np.fromiter((c.low for c in candles), np.float64, n),
+            close=np.fromiter((c.close for c in candles), np.float64, n),
+            candles=list(candles),
+        )
+
+    def candle(self, i: int) -> Candle:
+        """Row ``i`` as a Candle: the original object if there is one."""
+        if self.candles is not None:
+            return self.candles[i]
+        ts = self.timestamps[i].astype("datetime64[us]").item().replace(tzinfo=timezone.utc)
+        return Candle(
+            ts, float(self.open[i]), float(self.high[i]), float(self.low[i]), float(self.close[i])
+        )
+
+    def to_candles(self) -> List[Candle]:
+        if self.candles is not None:
+            return self.candles
+        return [self.candle(i) for i in range(len(self))]
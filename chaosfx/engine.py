@@ -168,7 +168,7 @@ class ChaosEngineFX:
                     "timestamp": datetime.now(timezone.utc).isoformat(),
                 })
         except Exception as e:
-            logger.debug(f"Could not update closed trades: {e}")
+            logger.debug("Could not update closed trades: %s", e)
 
     def run_once(self) -> Dict[str, Any]:
         """
@@ -318,7 +318,7 @@ class ChaosEngineFX:
         for pair in settings.FOREX_PAIRS[: settings.MAX_PAIRS]:
             try:
                 candles = self.client.get_candles(pair, granularity="M5", count=200)
-                signal, df, meta = generate_signal(
+                signal, bars, meta = generate_signal(
                     instrument=pair,
                     candles=candles,
                     sl_pips=settings.DEFAULT_SL_PIPS,
@@ -332,7 +332,7 @@ class ChaosEngineFX:
                     {
                         "pair": pair,
                         "signal": signal,
-                        "df": df,
+                        "bars": bars,
                         "volatility": vol_score,
                         "confidence": confidence,
                         "opportunity_score": opportunity_score,
@@ -340,13 +340,12 @@ class ChaosEngineFX:
                     }
                 )
                 logger.debug(
-                    f"{pair}: signal={signal.side} conf={confidence:.2f} "
-                    f"reason={signal.reason} vol={vol_score:.6f} "
-                    f"opp_score={opportunity_score:.4f} "
-                    f"atr_exp={meta.get('atr_expanding')} "
-                    f"breakout={meta.get('breakout_confirmed')} "
-                    f"trend={meta.get('trend_aligned')} "
-                    f"rr={meta.get('risk_reward', 0):.2f}"
+                    "%s: signal=%s conf=%.2f reason=%s vol=%.6f opp_score=%.4f "
+                    "atr_exp=%s breakout=%s trend=%s rr=%.2f",
+                    pair, signal.side, confidence, signal.reason, vol_score,
+                    opportunity_score, meta.get("atr_expanding"),
+                    meta.get("breakout_confirmed"), meta.get("trend_aligned"),
+                    meta.get("risk_reward", 0),
                 )
             except Exception as e:
                 logger.exception(f"Error analyzing {pair}: {e}")
@@ -424,13 +423,13 @@ class ChaosEngineFX:
         for a in candidate_list[: settings.VOLATILITY_TOP_K]:
             pair = a["pair"]
             signal: Signal = a["signal"]
-            df = a["df"]
+            bars = a["bars"]
             confidence = a["confidence"]
             vol_score = a["volatility"]
 
             try:
                 if any(t["instrument"] == pair for t in open_trades):
-                    logger.debug(f"Skipping {pair}: trade already open")
+                    logger.debug("Skipping %s: trade already open", pair)
                     continue
 
                 # Require confidence
@@ -510,7 +509,7 @@ class ChaosEngineFX:
                     )
                     continue
 
-                last_price = float(df["close"].iloc[-1])
+                last_price = float(bars.close[-1])
 
                 # Scale risk in surge mode
                 effective_equity = equity
@@ -526,7 +525,7 @@ class ChaosEngineFX:
                 )
 
                 if units <= 0:
-                    logger.debug(f"{pair}: position size <= 0, skip")
+                    logger.debug("%s: position size <= 0, skip", pair)
                     continue
 
                 if signal.side == "SHORT":
@@ -629,5 +628,5 @@ class ChaosEngineFX:
         logger.info("Starting ChaosEngine-FX loop")
         while True:
             summary = self.run_once()
-            logger.debug(f"Cycle summary: {summary}")
+            logger.debug("Cycle summary: %s", summary)
             time.sleep(settings.LOOP_INTERVAL_SECONDS)
@@ -0,0 +1,213 @@
+"""
+Numeric kernels for the ChaosFX strategy.
+
+Kernels take plain float64 arrays so the same source can be JIT-compiled
+with numba, AOT-compiled into the ``chaosfx_kernels`` extension by
+``build_kernels.py``, or run as plain Python/NumPy when numba is missing.
+"""
+
+import numpy as np
+
+from numba_compat import njit
+
+MA_FAST_PERIOD = 10
+MA_SLOW_PERIOD = 30
+MA_FAST_LAG = 4          # ma_fast 5 bars back (iloc[-5])
+ATR_PERIOD = 14
+ATR_MEAN_WINDOW = 50
+BREAKOUT_LOOKBACK = 20   # consolidation range, excluding the last 2 bars
+PIN_BAR_LOOKBACK = 10    # bars checked for a pin bar's local extreme
+
+# Layout of the vector returned by compute_features
+FEAT_MA_FAST = 0
+FEAT_MA_FAST_LAG = 1
+FEAT_MA_SLOW = 2
+FEAT_ATR = 3
+FEAT_ATR_MEAN = 4
+FEAT_RANGE_HIGH = 5      # breakout channel high
+FEAT_RANGE_LOW = 6       # breakout channel low
+FEAT_RECENT_HIGH = 7     # pin-bar lookback high
+FEAT_RECENT_LOW = 8      # pin-bar lookback low
+FEAT_RECENT_RANGE_MEAN = 9
+N_FEATURES = 10
+
+# Bars ending at the last one that cover every window above; the longest is
+# the ATR mean, which needs ATR_MEAN_WINDOW + ATR_PERIOD - 1 true ranges
+FEATURE_TAIL = ATR_MEAN_WINDOW + ATR_PERIOD - 1
+
+# Layout of the flags returned by eval_patterns
+PAT_BREAKOUT = 0
+PAT_BULL_ENGULF = 1
+PAT_BEAR_ENGULF = 2
+PAT_BULL_PIN = 3
+PAT_BEAR_PIN = 4
+N_PATTERNS = 5
+
+
+def _compute_features(o, h, l, c):
+    """
+    Last-bar rolling features used by generate_signal.
+
+    Matches the pandas definitions: SMA(10) now and 4 bars back, SMA(30),
+    ATR(14) as the simple mean of true range, and the 50-bar mean of ATR.
+    Also the breakout channel (high/low of the BREAKOUT_LOOKBACK bars before
+    the last 2) and the high, low and mean range of the last
+    PIN_BAR_LOOKBACK bars. A feature is NaN when there is not enough
+    history for its full window.
+
+    Everything is accumulated in one pass over the last FEATURE_TAIL bars.
+    """
+    n = c.shape[0]
+    out = np.full(N_FEATURES, np.nan)
+    start = max(n - FEATURE_TAIL, 0)
+    m = n - start
+
+    # True range; the first bar has no previous close so it is just high-low
+    h_tail = h[start:]
+    l_tail = l[start:]
+    tr = h_tail - l_tail
+    first = 1 if start == 0 else 0
+    prev_close = c[start + first - 1:n - 1]
+    tr[first:] = np.maximum(
+        np.maximum(tr[first:], np.abs(h_tail[first:] - prev_close)),
+        np.abs(l_tail[first:] - prev_close),
+    )
+
+    fast_start = n - MA_FAST_PERIOD
+    lag_start = fast_start - MA_FAST_LAG
+    lag_end = n - MA_FAST_LAG
+    slow_start = n - MA_SLOW_PERIOD
+    range_start = n - BREAKOUT_LOOKBACK - 2
+    range_end = n - 2
+    recent_start = n - PIN_BAR_LOOKBACK
+    mean_start = m - ATR_MEAN_WINDOW
+
+    fast_sum = 0.0
+    lag_sum = 0.0
+    slow_sum = 0.0
+    range_high = -np.inf
+    range_low = np.inf
+    recent_high = -np.inf
+    recent_low = np.inf
+    recent_range_sum = 0.0
+    window_sum = 0.0
+    atr_sum = 0.0
+    last_atr = np.nan
+
+    for j in range(m):
+        i = start + j
+        ci = c[i]
+        hi = h[i]
+        li = l[i]
+
+        if i >= fast_start:
+            fast_sum += ci
+        if lag_start <= i < lag_end:
+            lag_sum += ci
+        if i >= slow_start:
+            slow_sum += ci
+        if range_start <= i < range_end:
+            range_high = max(range_high, hi)
+            range_low = min(range_low, li)
+        if i >= recent_start:
+            recent_high = max(recent_high, hi)
+            recent_low = min(recent_low, li)
+            recent_range_sum += hi - li
+
+        # ATR(14) as a running window sum of TR, plus the sum of the last
+        # ATR_MEAN_WINDOW ATR values, without storing the ATR series
+        window_sum += tr[j]
+        if j >= ATR_PERIOD:
+            window_sum -= tr[j - ATR_PERIOD]
+        if j >= ATR_PERIOD - 1:
+            last_atr = window_sum / ATR_PERIOD
+            if j >= mean_start:
+                atr_sum += last_atr
+
+    if n >= MA_FAST_PERIOD:
+        out[FEAT_MA_FAST] = fast_sum / MA_FAST_PERIOD
+    if n >= MA_FAST_PERIOD + MA_FAST_LAG:
+        out[FEAT_MA_FAST_LAG] = lag_sum / MA_FAST_PERIOD
+    if n >= MA_SLOW_PERIOD:
+        out[FEAT_MA_SLOW] = slow_sum / MA_SLOW_PERIOD
+
+    out[FEAT_ATR] = last_atr
+    # The mean is only defined once every ATR in its window is (as with pandas
+    # rolling means, which yield NaN for a partially filled window)
+    if mean_start >= ATR_PERIOD - 1:
+        out[FEAT_ATR_MEAN] = atr_sum / ATR_MEAN_WINDOW
+
+    if n >= BREAKOUT_LOOKBACK + 2:
+        out[FEAT_RANGE_HIGH] = range_high
+        out[FEAT_RANGE_LOW] = range_low
+    if n > 0:
+        out[FEAT_RECENT_HIGH] = recent_high
+        out[FEAT_RECENT_LOW] = recent_low
+        out[FEAT_RECENT_RANGE_MEAN] = recent_range_sum / min(n, PIN_BAR_LOOKBACK)
+    return out
+
+
+def _eval_patterns(o, h, l, c, features):
+    """
+    Breakout and candlestick pattern flags for the last bar, given the
+    vector from compute_features.
+
+    - breakout: last close outside the FEAT_RANGE_HIGH/LOW channel
+    - engulfing: last body engulfs the opposite-coloured previous body
+    - pin bar: wick > 2x body, extreme within a quarter of the recent mean
+      range of the recent low/high, and the bar closes in the pin's direction
+    """
+    n = c.shape[0]
+    out = np.zeros(N_PATTERNS, dtype=np.bool_)
+    if n < 2:
+        return out
+
+    last_open = o[n - 1]
+    last_high = h[n - 1]
+    last_low = l[n - 1]
+    last_close = c[n - 1]
+
+    # NaN channel (short history) compares False either way
+    out[PAT_BREAKOUT] = (
+        last_close > features[FEAT_RANGE_HIGH] or last_close < features[FEAT_RANGE_LOW]
+    )
+
+    prev_open = o[n - 2]
+    prev_close = c[n - 2]
+    prev_body = prev_close - prev_open
+    curr_body = last_close - last_open
+    engulfs = abs(curr_body) > abs(prev_body)
+    out[PAT_BULL_ENGULF] = (
+        prev_body < 0 and curr_body > 0 and engulfs
+        and last_close >= prev_open and last_open <= prev_close
+    )
+    out[PAT_BEAR_ENGULF] = (
+        prev_body > 0 and curr_body < 0 and engulfs
+        and last_close <= prev_open and last_open >= prev_close
+    )
+
+    recent_range_mean = features[FEAT_RECENT_RANGE_MEAN]
+    body = abs(curr_body)
+    upper_wick = last_high - max(last_close, last_open)
+    lower_wick = min(last_close, last_open) - last_low
+    out[PAT_BULL_PIN] = (
+        lower_wick > 2 * body
+        and last_low <= features[FEAT_RECENT_LOW] + 0.25 * recent_range_mean
+        and last_close >= last_open
+    )
+    out[PAT_BEAR_PIN] = (
+        upper_wick > 2 * body
+        and last_high >= features[FEAT_RECENT_HIGH] - 0.25 * recent_range_mean
+        and last_close <= last_open
+    )
+    return out
+
+
+compute_features = njit(cache=True)(_compute_features)
+eval_patterns = njit(cache=True)(_eval_patterns)
+
+try:
+    # Prefer the ahead-of-time build so the first signal doesn't pay JIT latency
+    from chaosfx_kernels import compute_features, eval_patterns  # noqa: F811
+except ImportError:
+    pass
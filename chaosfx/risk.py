@@ -1,10 +1,46 @@
 import logging
 from typing import Tuple, Dict, List, Any
 
+import numpy as np
+
 from chaosfx.config import settings
 
 logger = logging.getLogger("chaosfx.risk")
 
+# Currency index table built once from CURRENCY_COMPONENTS so exposure can be
+# accumulated with a vectorized scatter instead of per-trade dict updates.
+_CCY_LIST: List[str] = sorted(
+    {ccy for ccys in settings.CURRENCY_COMPONENTS.values() for ccy in ccys}
+)
+_CCY_INDEX: Dict[str, int] = {ccy: i for i, ccy in enumerate(_CCY_LIST)}
+_PAIR_INSTRUMENTS: List[str] = [
+    instrument
+    for instrument, ccys in settings.CURRENCY_COMPONENTS.items()
+    if len(ccys) == 2
+]
+_INSTRUMENT_ROW: Dict[str, int] = {
+    instrument: row for row, instrument in enumerate(_PAIR_INSTRUMENTS)
+}
+# One (base index, quote index) row per two-currency instrument
+_PAIR_CCY_IDX: np.ndarray = np.array(
+    [
+        [_CCY_INDEX[ccy] for ccy in settings.CURRENCY_COMPONENTS[instrument]]
+        for instrument in _PAIR_INSTRUMENTS
+    ],
+    dtype=np.intp,
+).reshape(-1, 2)
+# units > 0 = long (buy base, sell quote)
+# units < 0 = short (sell base, buy quote)
+_PAIR_CCY_SIGN = np.array([1.0, -1.0])
+
+# USD-containing pairs -> True when USD is the base currency. A position is
+# long USD when (units > 0) == is_base_usd, e.g. long USD_JPY or short EUR_USD.
+_USD_DIR_TABLE: Dict[str, bool] = {
+    instrument: ccys[0] == "USD"
+    for instrument, ccys in settings.CURRENCY_COMPONENTS.items()
+    if len(ccys) == 2 and "USD" in ccys
+}
+
 
 def compute_position_size(
     instrument: str,
@@ -73,6 +109,15 @@ def validate_risk_reward(
     return rr >= settings.MIN_RISK_REWARD, rr
 
 
+# (volatility threshold, target R:R) tiers, highest first; the last tier
+# catches everything else.
+_RR_TIERS: Tuple[Tuple[float, float], ...] = (
+    (settings.VOLATILITY_MIN_SCORE * 2.0, settings.MAX_RISK_REWARD),
+    (settings.VOLATILITY_MIN_SCORE * 1.5, settings.PREFERRED_RISK_REWARD),
+    (float("-inf"), settings.MIN_RISK_REWARD),
+)
+
+
 def select_risk_reward_target(volatility_score: float) -> float:
     """
     Select the target R:R based on current volatility.
@@ -81,13 +126,9 @@ def select_risk_reward_target(volatility_score: float) -> float:
     - Medium volatility: use PREFERRED_RISK_REWARD (1:2.5)
     - Base: use MIN_RISK_REWARD (1:2)
     """
-    high_vol_threshold = settings.VOLATILITY_MIN_SCORE * 2.0
-    med_vol_threshold = settings.VOLATILITY_MIN_SCORE * 1.5
-
-    if volatility_score >= high_vol_threshold:
-        return settings.MAX_RISK_REWARD
-    elif volatility_score >= med_vol_threshold:
-        return settings.PREFERRED_RISK_REWARD
+    for threshold, target_rr in _RR_TIERS:
+        if volatility_score >= threshold:
+            return target_rr
     return settings.MIN_RISK_REWARD
 
 
@@ -95,6 +136,21 @@ def select_risk_reward_target(volatility_score: float) -> float:
 # Portfolio risk calculation (AGGRESSIVE MODE)
 # ---------------------------------------------------------------------------
 
+def _trade_units(trade: Dict[str, Any]) -> float:
+    return float(trade.get("currentUnits", trade.get("initialUnits", 0)))
+
+
+def _trade_row(trade: Dict[str, Any]) -> Tuple[float, float, float]:
+    units = _trade_units(trade)
+    price = float(trade.get("price", 0))
+    sl_orders = trade.get("stopLossOrder", {})
+    if sl_orders and isinstance(sl_orders, dict):
+        sl_price = float(sl_orders.get("price", price))
+    else:
+        sl_price = price
+    return units, price, sl_price
+
+
 def compute_portfolio_risk(
     open_trades: List[Dict[str, Any]],
     equity: float,
@@ -108,22 +164,22 @@ def compute_portfolio_risk(
     if equity <= 0:
         return 0.0
 
-    total_risk = 0.0
-    for trade in open_trades:
-        try:
-            units = abs(float(trade.get("currentUnits", trade.get("initialUnits", 0))))
-            price = float(trade.get("price", 0))
-            sl_orders = trade.get("stopLossOrder", {})
-            if sl_orders and isinstance(sl_orders, dict):
-                sl_price = float(sl_orders.get("price", price))
-            else:
-                sl_price = price
-            stop_distance = abs(price - sl_price)
-            trade_risk = units * stop_distance
-            total_risk += trade_risk
-        except (ValueError, TypeError):
-            continue
+    # One pass over the trades; ones with unparseable numeric fields are
+    # dropped
+    try:
+        rows = [_trade_row(t) for t in open_trades]
+    except (ValueError, TypeError):
+        rows = []
+        for t in open_trades:
+            try:
+                rows.append(_trade_row(t))
+            except (ValueError, TypeError):
+                continue
+    if not rows:
+        return 0.0
 
+    units, price, sl_price = np.array(rows, dtype=np.float64).T
+    total_risk = float(np.abs(units).dot(np.abs(price - sl_price)))
     return total_risk / equity
 
 
@@ -154,13 +210,14 @@ def check_consecutive_loss_kill_switch(recent_trades: List[Dict[str, Any]]) -> b
     if len(recent_trades) < threshold:
         return False
 
-    # Check last `threshold` trades
-    last_trades = recent_trades[-threshold:]
-    consecutive_losses = all(
-        float(t.get("pl", t.get("realizedPL", 0))) < 0
-        for t in last_trades
-    )
-    return consecutive_losses
+    # Check last `threshold` trades, newest first: any non-loss ends the streak
+    for t in reversed(recent_trades[-threshold:]):
+        pl = t.get("pl")
+        if pl is None:
+            pl = t.get("realizedPL", 0)
+        if float(pl) >= 0:
+            return False
+    return True
 
 
 # ---------------------------------------------------------------------------
@@ -180,21 +237,29 @@ def compute_currency_exposure(
 
     Returns a dict like {"EUR": 500000, "USD": -500000, "GBP": 0, ...}
     """
-    exposure: Dict[str, float] = {}
+    # Only units and instrument matter here: a trade whose price or SL is
+    # missing or malformed still carries its full exposure
+    n = len(open_trades)
+    units = np.fromiter((_trade_units(t) for t in open_trades), np.float64, n)
+    rows = np.fromiter(
+        (_INSTRUMENT_ROW.get(t.get("instrument", ""), -1) for t in open_trades), np.intp, n
+    )
 
-    for trade in open_trades:
-        instrument = trade.get("instrument", "")
-        units = float(trade.get("currentUnits", trade.get("initialUnits", 0)))
-        # units > 0 = long (buy base, sell quote)
-        # units < 0 = short (sell base, buy quote)
+    known = rows >= 0
+    if not known.any():
+        return {}
+
+    # (trades, 2) currency indexes and signed amounts, scattered in one go
+    ccy_idx = _PAIR_CCY_IDX[rows[known]]
+    exposure_vec = np.zeros(len(_CCY_LIST), dtype=np.float64)
+    np.add.at(exposure_vec, ccy_idx, units[known, None] * _PAIR_CCY_SIGN)
 
-        currencies = settings.CURRENCY_COMPONENTS.get(instrument, [])
-        if len(currencies) == 2:
-            base_ccy, quote_ccy = currencies[0], currencies[1]
-            exposure[base_ccy] = exposure.get(base_ccy, 0.0) + units
-            exposure[quote_ccy] = exposure.get(quote_ccy, 0.0) - units
+    # Currencies in the order the trades first touch them
+    return {_CCY_LIST[i]: float(exposure_vec[i]) for i in dict.fromkeys(ccy_idx.ravel().tolist())}
 
-    return exposure
+
+# Indexed by sign(USD exposure) + 1
+_USD_BIAS = ("short_usd", "neutral", "long_usd")
 
 
 def get_usd_directional_bias(exposure: Dict[str, float]) -> str:
@@ -204,11 +269,7 @@ def get_usd_directional_bias(exposure: Dict[str, float]) -> str:
     Returns "long_usd", "short_usd", or "neutral".
     """
     usd_exposure = exposure.get("USD", 0.0)
-    if usd_exposure > 0:
-        return "long_usd"
-    elif usd_exposure < 0:
-        return "short_usd"
-    return "neutral"
+    return _USD_BIAS[(usd_exposure > 0) - (usd_exposure < 0) + 1]
 
 
 def would_stack_usd_exposure(
@@ -222,42 +283,29 @@ def would_stack_usd_exposure(
     Only 1 strong USD bias position at a time.
     Returns True if the trade should be BLOCKED.
     """
-    currencies = settings.CURRENCY_COMPONENTS.get(instrument, [])
-    if "USD" not in currencies:
+    is_base_usd = _USD_DIR_TABLE.get(instrument)
+    if is_base_usd is None:
         return False  # non-USD pair, no stacking concern
 
-    # Determine what USD direction this new trade would add
-    if len(currencies) == 2:
-        base_ccy = currencies[0]
-        if base_ccy == "USD":
-            # e.g., USD_JPY: LONG = long USD, SHORT = short USD
-            new_usd_direction = "long_usd" if side == "LONG" else "short_usd"
-        else:
-            # e.g., EUR_USD: LONG = short USD, SHORT = long USD
-            new_usd_direction = "short_usd" if side == "LONG" else "long_usd"
-    else:
-        return False
+    # Direction this new trade would add, e.g. USD_JPY LONG = long USD,
+    # EUR_USD LONG = short USD
+    new_is_long_usd = (side == "LONG") == is_base_usd
+    max_usd_trades = settings.MAX_USD_DIRECTIONAL_TRADES
 
-    # Count existing USD-directional trades
+    # Count existing USD-directional trades, stopping once the limit is hit
     usd_directional_count = 0
     for trade in open_trades:
-        t_instrument = trade.get("instrument", "")
-        t_currencies = settings.CURRENCY_COMPONENTS.get(t_instrument, [])
-        if "USD" not in t_currencies:
+        t_is_base_usd = _USD_DIR_TABLE.get(trade.get("instrument", ""))
+        if t_is_base_usd is None:
             continue
 
         t_units = float(trade.get("currentUnits", trade.get("initialUnits", 0)))
-        if len(t_currencies) == 2:
-            t_base = t_currencies[0]
-            if t_base == "USD":
-                t_direction = "long_usd" if t_units > 0 else "short_usd"
-            else:
-                t_direction = "short_usd" if t_units > 0 else "long_usd"
+        if ((t_units > 0) == t_is_base_usd) == new_is_long_usd:
+            usd_directional_count += 1
+            if usd_directional_count >= max_usd_trades:
+                return True
 
-            if t_direction == new_usd_direction:
-                usd_directional_count += 1
-
-    return usd_directional_count >= settings.MAX_USD_DIRECTIONAL_TRADES
+    return usd_directional_count >= max_usd_trades
 
 
 def compute_trade_risk_pct(
@@ -302,3 +350,29 @@ def compute_r_multiple(
         if risk <= 0:
             return 0.0
         return (entry_price - exit_price) / risk
+
+
+def compute_r_multiple_batch(
+    entry_price: np.ndarray,
+    stop_loss_price: np.ndarray,
+    exit_price: np.ndarray,
+    is_long: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized compute_r_multiple over arrays of closed trades.
+
+    ``is_long`` is a boolean array (True = LONG, False = SHORT). Trades with
+    non-positive risk get an R of 0.0, as in the scalar version.
+    """
+    entry_price = np.asarray(entry_price, dtype=np.float64)
+    stop_loss_price = np.asarray(stop_loss_price, dtype=np.float64)
+    exit_price = np.asarray(exit_price, dtype=np.float64)
+    is_long = np.asarray(is_long, dtype=bool)
+
+    risk = np.where(is_long, entry_price - stop_loss_price, stop_loss_price - entry_price)
+    reward = np.where(is_long, exit_price - entry_price, entry_price - exit_price)
+
+    valid = risk > 0
+    out = np.zeros_like(risk)
+    np.divide(reward, risk, out=out, where=valid)
+    return out
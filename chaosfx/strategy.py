@@ -1,14 +1,35 @@
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Literal, Optional, Tuple, Dict, Any
 import pandas as pd
 import numpy as np
 
 from chaosfx.config import settings
+from chaosfx.risk import select_risk_reward_target, validate_risk_reward
+from chaosfx.kernels import (
+    compute_features,
+    eval_patterns,
+    FEAT_MA_FAST,
+    FEAT_MA_FAST_LAG,
+    FEAT_MA_SLOW,
+    FEAT_ATR,
+    FEAT_ATR_MEAN,
+    PAT_BREAKOUT,
+    PAT_BULL_ENGULF,
+    PAT_BEAR_ENGULF,
+    PAT_BULL_PIN,
+    PAT_BEAR_PIN,
+)
 
 SignalSide = Literal["LONG", "SHORT", "FLAT"]
 
+# generate_signal results keyed on the candle window they were computed from,
+# so repeated polls between candle closes skip the whole computation
+_SIGNAL_CACHE: "OrderedDict[tuple, tuple]" = OrderedDict()
+_SIGNAL_CACHE_SIZE = 256
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class Signal:
     side: SignalSide
     stop_loss: Optional[float]
@@ -17,29 +38,70 @@ class Signal:
     risk_reward: float = 0.0  # actual R:R for this signal
 
 
-def _candle_df_from_oanda(candles) -> pd.DataFrame:
+class _Bars:
+    """
+    Completed OHLC bars as parallel float64 arrays.
+
+    Signal generation works on the arrays directly; the time-indexed pandas
+    DataFrame is only built if a caller accesses ``df``.
+    """
+
+    __slots__ = ("time", "open", "high", "low", "close", "_df")
+
+    def __init__(self, time, open_, high, low, close):
+        self.time = time
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.close = close
+        self._df: Optional[pd.DataFrame] = None
+
+    def __len__(self) -> int:
+        return self.close.shape[0]
+
+    @property
+    def df(self) -> pd.DataFrame:
+        if self._df is None:
+            # OANDA times are RFC3339 ("...T00:00:00.000000000Z"); an explicit
+            # ISO8601 format keeps parsing on the fast path
+            index = pd.DatetimeIndex(
+                pd.to_datetime(self.time, format="ISO8601", utc=True, cache=True),
+                name="time",
+            )
+            self._df = pd.DataFrame(
+                {"open": self.open, "high": self.high, "low": self.low, "close": self.close},
+                index=index,
+            )
+        return self._df
+
+
+def _bars_from_oanda(candles) -> _Bars:
     """
-    Convert Oanda candle list into OHLC DataFrame.
+    Convert Oanda candle list into OHLC arrays (completed candles only).
+
+    Single pass into pre-sized float64 arrays, trimmed to the number of
+    completed candles. Times stay as the raw strings until ``df`` is needed.
     """
-    rows = []
+    n = len(candles)
+    open_ = np.empty(n, dtype=np.float64)
+    high = np.empty(n, dtype=np.float64)
+    low = np.empty(n, dtype=np.float64)
+    close = np.empty(n, dtype=np.float64)
+    times = []
+
+    k = 0
     for c in candles:
         if not c["complete"]:
             continue
-        t = c["time"]
         mid = c["mid"]
-        rows.append(
-            {
-                "time": pd.to_datetime(t),
-                "open": float(mid["o"]),
-                "high": float(mid["h"]),
-                "low": float(mid["l"]),
-                "close": float(mid["c"]),
-            }
-        )
+        open_[k] = float(mid["o"])
+        high[k] = float(mid["h"])
+        low[k] = float(mid["l"])
+        close[k] = float(mid["c"])
+        times.append(c["time"])
+        k += 1
 
-    df = pd.DataFrame(rows)
-    df.set_index("time", inplace=True)
-    return df
+    return _Bars(times, open_[:k], high[:k], low[:k], close[:k])
 
 
 def generate_signal(
@@ -47,7 +109,7 @@ def generate_signal(
     candles,
     sl_pips: float,
     tp_pips: float,
-) -> Tuple[Signal, pd.DataFrame, Dict[str, Any]]:
+) -> Tuple[Signal, _Bars, Dict[str, Any]]:
     """
     AGGRESSIVE MODE strategy logic:
 
@@ -62,11 +124,67 @@ def generate_signal(
     - No ranging-market entries in aggressive mode
     - Enforces minimum R:R of 2.0 (rejects trades below)
     - Returns:
-        Signal, OHLC df, meta {volatility, confidence, atr_expanding,
-        breakout_confirmed, trend_aligned, risk_reward}
+        Signal, OHLC bars (``bars.df`` for a DataFrame), meta {volatility,
+        confidence, atr_expanding, breakout_confirmed, trend_aligned,
+        risk_reward}
     """
-    df = _candle_df_from_oanda(candles)
+    key = _signal_cache_key(instrument, candles, sl_pips, tp_pips)
+    cached = _SIGNAL_CACHE.get(key) if key is not None else None
+    if cached is not None:
+        _SIGNAL_CACHE.move_to_end(key)
+        signal, bars, meta = cached
+        return signal, bars, dict(meta)
+
+    bars = _bars_from_oanda(candles)
+    signal, meta = _generate_signal_core(
+        instrument, bars.open, bars.high, bars.low, bars.close, sl_pips, tp_pips
+    )
+
+    if key is not None:
+        _SIGNAL_CACHE[key] = (signal, bars, meta)
+        if len(_SIGNAL_CACHE) > _SIGNAL_CACHE_SIZE:
+            _SIGNAL_CACHE.popitem(last=False)
+        meta = dict(meta)
+    return signal, bars, meta
+
 
+def _signal_cache_key(instrument: str, candles, sl_pips: float, tp_pips: float):
+    """
+    Identify a candle window by its first candle and its last completed
+    candle (time + OHLC). Completed OANDA candles never change, so the same
+    window always yields the same signal. Returns None when there is no
+    completed candle.
+    """
+    for c in reversed(candles):
+        if c["complete"]:
+            mid = c["mid"]
+            return (
+                instrument,
+                sl_pips,
+                tp_pips,
+                len(candles),
+                candles[0]["time"],
+                c["time"],
+                mid["o"],
+                mid["h"],
+                mid["l"],
+                mid["c"],
+            )
+    return None
+
+
+def _generate_signal_core(
+    instrument: str,
+    open_arr: np.ndarray,
+    high_arr: np.ndarray,
+    low_arr: np.ndarray,
+    close_arr: np.ndarray,
+    sl_pips: float,
+    tp_pips: float,
+) -> Tuple[Signal, Dict[str, Any]]:
+    """
+    Signal logic of generate_signal on raw OHLC arrays.
+    """
     flat_meta = {
         "volatility": 0.0,
         "confidence": 0.0,
@@ -77,35 +195,41 @@ def generate_signal(
         "opportunity_score": 0.0,
     }
 
-    if len(df) < 60:
-        return Signal("FLAT", None, None, "not_enough_data"), df, flat_meta
+    if close_arr.shape[0] < 60:
+        return Signal("FLAT", None, None, "not_enough_data"), flat_meta
+
+    # Bind settings once per call rather than per use
+    atr_expansion_mult = settings.ATR_EXPANSION_MULTIPLIER
+    vol_min_score = settings.VOLATILITY_MIN_SCORE
+    atr_sl_mult = settings.ATR_SL_MULTIPLIER
 
-    # Core features
-    df["ma_fast"] = df["close"].rolling(window=10).mean()
-    df["ma_slow"] = df["close"].rolling(window=30).mean()
-    df["atr"] = _atr(df, period=14)
-    df["body"] = (df["close"] - df["open"]).abs()
-    df["range"] = df["high"] - df["low"]
-    df["upper_wick"] = df["high"] - df[["close", "open"]].max(axis=1)
-    df["lower_wick"] = df[["close", "open"]].min(axis=1) - df["low"]
+    # MA(10) now and 5 bars back, MA(30), ATR(14) and its 50-bar mean, plus
+    # the breakout and pin-bar channels used by eval_patterns
+    features = compute_features(open_arr, high_arr, low_arr, close_arr)
+    ma_fast_last = float(features[FEAT_MA_FAST])
+    ma_fast_lag = float(features[FEAT_MA_FAST_LAG])
+    ma_slow_last = float(features[FEAT_MA_SLOW])
+    last_atr = float(features[FEAT_ATR])
+    recent_atr_mean = float(features[FEAT_ATR_MEAN])
+    # NaN checks on plain floats via self-inequality, done once
+    atr_ok = last_atr == last_atr
+    atr_mean_ok = recent_atr_mean == recent_atr_mean
 
-    last = df.iloc[-1]
-    prev = df.iloc[-2]
+    last_close = float(close_arr[-1])
 
     # Volatility score
     vol_score = 0.0
-    if not np.isnan(last["atr"]) and last["close"] > 0:
-        vol_score = float(last["atr"] / last["close"])
+    if atr_ok and last_close > 0:
+        vol_score = last_atr / last_close
 
     # -----------------------------------------------------------------------
     # AGGRESSIVE MODE: ATR expansion filter (Critical)
     # Only allow trades when ATR(14) is expanding
     # -----------------------------------------------------------------------
-    recent_atr_mean = df["atr"].rolling(window=50).mean().iloc[-1]
     atr_expanding = (
-        not np.isnan(last["atr"])
-        and not np.isnan(recent_atr_mean)
-        and last["atr"] > settings.ATR_EXPANSION_MULTIPLIER * recent_atr_mean
+        atr_ok
+        and atr_mean_ok
+        and last_atr > atr_expansion_mult * recent_atr_mean
     )
 
     # -----------------------------------------------------------------------
@@ -114,16 +238,10 @@ def generate_signal(
     # -----------------------------------------------------------------------
     trend = "FLAT"
     trend_aligned = False
-    if (
-        last["ma_fast"] > last["ma_slow"]
-        and df["ma_fast"].iloc[-1] > df["ma_fast"].iloc[-5]
-    ):
+    if ma_fast_last > ma_slow_last and ma_fast_last > ma_fast_lag:
         trend = "UP"
         trend_aligned = True
-    elif (
-        last["ma_fast"] < last["ma_slow"]
-        and df["ma_fast"].iloc[-1] < df["ma_fast"].iloc[-5]
-    ):
+    elif ma_fast_last < ma_slow_last and ma_fast_last < ma_fast_lag:
         trend = "DOWN"
         trend_aligned = True
 
@@ -131,7 +249,9 @@ def generate_signal(
     # AGGRESSIVE MODE: Breakout structure detection
     # Price breaking above/below recent consolidation range
     # -----------------------------------------------------------------------
-    breakout_confirmed = _detect_breakout(df)
+    # Pattern flags for the last bar, from the channels computed above
+    patterns = eval_patterns(open_arr, high_arr, low_arr, close_arr, features)
+    breakout_confirmed = bool(patterns[PAT_BREAKOUT])
 
     # -----------------------------------------------------------------------
     # AGGRESSIVE MODE: All three filters must pass
@@ -144,7 +264,7 @@ def generate_signal(
             "breakout_confirmed": breakout_confirmed,
             "trend_aligned": trend_aligned,
         })
-        return Signal("FLAT", None, None, "atr_not_expanding"), df, flat_meta
+        return Signal("FLAT", None, None, "atr_not_expanding"), flat_meta
 
     if not trend_aligned:
         flat_meta.update({
@@ -153,7 +273,7 @@ def generate_signal(
             "breakout_confirmed": breakout_confirmed,
             "trend_aligned": False,
         })
-        return Signal("FLAT", None, None, "no_trend_alignment_ranging"), df, flat_meta
+        return Signal("FLAT", None, None, "no_trend_alignment_ranging"), flat_meta
 
     if not breakout_confirmed:
         flat_meta.update({
@@ -162,13 +282,13 @@ def generate_signal(
             "breakout_confirmed": False,
             "trend_aligned": True,
         })
-        return Signal("FLAT", None, None, "no_breakout_structure"), df, flat_meta
+        return Signal("FLAT", None, None, "no_breakout_structure"), flat_meta
 
     # Patterns
-    bull_engulf = _bullish_engulfing(last, prev)
-    bear_engulf = _bearish_engulfing(last, prev)
-    bull_pin = _bullish_pin_bar(df)
-    bear_pin = _bearish_pin_bar(df)
+    bull_engulf = bool(patterns[PAT_BULL_ENGULF])
+    bear_engulf = bool(patterns[PAT_BEAR_ENGULF])
+    bull_pin = bool(patterns[PAT_BULL_PIN])
+    bear_pin = bool(patterns[PAT_BEAR_PIN])
 
     side: SignalSide = "FLAT"
     reason = "no_signal"
@@ -178,8 +298,8 @@ def generate_signal(
     trend_alignment_score = 0.0
     vol_component = 0.0
 
-    if vol_score > 0 and settings.VOLATILITY_MIN_SCORE > 0:
-        vol_component = min(vol_score / settings.VOLATILITY_MIN_SCORE, 2.0)
+    if vol_score > 0 and vol_min_score > 0:
+        vol_component = min(vol_score / vol_min_score, 2.0)
 
     # LONG setups (only with trend — no countertrend in aggressive mode)
     if trend == "UP" and (bull_engulf or bull_pin):
@@ -217,25 +337,24 @@ def generate_signal(
             "breakout_confirmed": True,
             "trend_aligned": True,
         })
-        return Signal(side, None, None, reason), df, flat_meta
+        return Signal(side, None, None, reason), flat_meta
 
     # -----------------------------------------------------------------------
     # ATR-based dynamic SL/TP with R:R enforcement
     # -----------------------------------------------------------------------
-    price = last["close"]
+    price = last_close
     pip_factor = _pip_factor(instrument)
 
     atr_in_pips = 0.0
-    if not np.isnan(last["atr"]):
-        atr_in_pips = last["atr"] / pip_factor
+    if atr_ok:
+        atr_in_pips = last_atr / pip_factor
 
     # Select target R:R based on volatility
-    from chaosfx.risk import select_risk_reward_target
     target_rr = select_risk_reward_target(vol_score)
 
     # Dynamic SL using ATR
     if atr_in_pips > 0:
-        dyn_sl_pips = max(sl_pips, atr_in_pips * settings.ATR_SL_MULTIPLIER)
+        dyn_sl_pips = max(sl_pips, atr_in_pips * atr_sl_mult)
         # TP forced to meet minimum R:R
         dyn_tp_pips = max(tp_pips, dyn_sl_pips * target_rr)
     else:
@@ -258,7 +377,6 @@ def generate_signal(
     # -----------------------------------------------------------------------
     # AGGRESSIVE MODE: Validate R:R >= 2.0 (reject if below)
     # -----------------------------------------------------------------------
-    from chaosfx.risk import validate_risk_reward
     rr_valid, actual_rr = validate_risk_reward(price, stop_loss, take_profit, side)
 
     if not rr_valid:
@@ -270,7 +388,7 @@ def generate_signal(
             "trend_aligned": True,
             "risk_reward": actual_rr,
         })
-        return Signal("FLAT", None, None, f"rr_too_low_{actual_rr:.2f}"), df, flat_meta
+        return Signal("FLAT", None, None, f"rr_too_low_{actual_rr:.2f}"), flat_meta
 
     # Final confidence score
     confidence = vol_component + pattern_strength + trend_alignment_score
@@ -280,13 +398,13 @@ def generate_signal(
     # Combines ATR expansion strength, trend strength, breakout strength
     # -----------------------------------------------------------------------
     atr_expansion_ratio = 0.0
-    if not np.isnan(last["atr"]) and not np.isnan(recent_atr_mean) and recent_atr_mean > 0:
-        atr_expansion_ratio = float(last["atr"] / recent_atr_mean)
+    if atr_ok and atr_mean_ok and recent_atr_mean > 0:
+        atr_expansion_ratio = float(last_atr / recent_atr_mean)
 
     # Trend strength: how far apart are the MAs relative to price
     trend_strength = 0.0
-    if last["close"] > 0:
-        trend_strength = abs(float(last["ma_fast"] - last["ma_slow"])) / last["close"]
+    if last_close > 0:
+        trend_strength = abs(ma_fast_last - ma_slow_last) / last_close
 
     opportunity_score = (
         atr_expansion_ratio * 0.4
@@ -310,113 +428,19 @@ def generate_signal(
         "opportunity_score": float(opportunity_score),
     }
 
-    return Signal(side, stop_loss, take_profit, reason, actual_rr), df, meta
-
-
-def _detect_breakout(df: pd.DataFrame, lookback: int = 20) -> bool:
-    """
-    AGGRESSIVE MODE: Detect breakout structure.
-
-    A breakout is confirmed when the latest close is above or below the
-    recent consolidation range (defined by the high/low channel of the
-    lookback period, excluding the last 2 candles which form the breakout).
-
-    This filters out ranging/choppy markets.
-    """
-    if len(df) < lookback + 2:
-        return False
-
-    # Consolidation range = high/low of lookback candles before the last 2
-    consolidation = df.iloc[-(lookback + 2):-2]
-    range_high = consolidation["high"].max()
-    range_low = consolidation["low"].min()
+    return Signal(side, stop_loss, take_profit, reason, actual_rr), meta
 
-    last = df.iloc[-1]
 
-    # Breakout above or below the consolidation range
-    breakout_up = last["close"] > range_high
-    breakout_down = last["close"] < range_low
-
-    return breakout_up or breakout_down
+# instrument -> decimal per pip, filled on first use
+_PIP_CACHE: Dict[str, float] = {}
 
 
 def _pip_factor(instrument: str) -> float:
     """
     Approximate decimal per pip for instrument.
     """
-    if "JPY" in instrument:
-        return 0.01
-    if "XAU" in instrument:
-        return 0.01
-    return 0.0001
-
-
-def _atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
-    high_low = df["high"] - df["low"]
-    high_close = (df["high"] - df["close"].shift()).abs()
-    low_close = (df["low"] - df["close"].shift()).abs()
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    return tr.rolling(window=period).mean()
-
-
-def _bullish_engulfing(last: pd.Series, prev: pd.Series) -> bool:
-    """
-    Bullish engulfing pattern on the last two candles.
-    We compare absolute body size using built-in abs() so we don't
-    hit numpy.float64 `.abs` attribute errors.
-    """
-    prev_body = float(prev["close"] - prev["open"])
-    curr_body = float(last["close"] - last["open"])
-
-    prev_bear = prev_body < 0   # previous red
-    curr_bull = curr_body > 0   # current green
-
-    body_engulf = (
-        last["close"] >= prev["open"]
-        and last["open"] <= prev["close"]
-        and abs(curr_body) > abs(prev_body)
-    )
-
-    return bool(prev_bear and curr_bull and body_engulf)
-
-
-def _bearish_engulfing(last: pd.Series, prev: pd.Series) -> bool:
-    """
-    Bearish engulfing pattern on the last two candles.
-    """
-    prev_body = float(prev["close"] - prev["open"])
-    curr_body = float(last["close"] - last["open"])
-
-    prev_bull = prev_body > 0   # previous green
-    curr_bear = curr_body < 0   # current red
-
-    body_engulf = (
-        last["close"] <= prev["open"]
-        and last["open"] >= prev["close"]
-        and abs(curr_body) > abs(prev_body)
-    )
-
-    return bool(prev_bull and curr_bear and body_engulf)
-
-
-def _bullish_pin_bar(df: pd.DataFrame, lookback: int = 10) -> bool:
-    """
-    Long lower wick, small body, near short-term low.
-    """
-    last = df.iloc[-1]
-    recent = df.iloc[-lookback:]
-    body = last["body"]
-    lower_wick = last["lower_wick"]
-    is_pin = lower_wick > 2 * body and last["low"] <= recent["low"].min() + 0.25 * recent["range"].mean()
-    closes_ok = last["close"] >= last["open"]
-    return bool(is_pin and closes_ok)
-
-
-def _bearish_pin_bar(df: pd.DataFrame, lookback: int = 10) -> bool:
-    last = df.iloc[-1]
-    recent = df.iloc[-lookback:]
-    body = last["body"]
-    upper_wick = last["upper_wick"]
-    is_pin = upper_wick > 2 * body and last["high"] >= recent["high"].max() - 0.25 * recent["range"].mean()
-    closes_ok = last["close"] <= last["open"]
-    return bool(is_pin and closes_ok)
+    factor = _PIP_CACHE.get(instrument)
+    if factor is None:
+        factor = 0.01 if ("JPY" in instrument or "XAU" in instrument) else 0.0001
+        _PIP_CACHE[instrument] = factor
+    return factor
@@ -1,10 +1,12 @@
 import os
 
+_TRUTHY = frozenset(("1", "true", "yes", "y", "on"))
+
 
 def is_truthy(value: str | None) -> bool:
     if value is None:
         return False
-    return value.strip().lower() in {"1", "true", "yes", "y", "on"}
+    return value.strip().lower() in _TRUTHY
 
 
 def getenv(name: str, default: str | None = None) -> str | None:
@@ -3,9 +3,16 @@ from __future__ import annotations
 import logging
 import os
 import time as _time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, List, Dict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, List, Dict, Mapping
+
+import numpy as np
+import pandas as pd
 
 import social_signals
 
@@ -17,6 +24,18 @@ _SOCIAL_SIZE_BOOST_PCT = float(os.getenv("SOCIAL_SIZE_BOOST_PCT", "25"))  # +25%
 _SOCIAL_SIZE_CUT_PCT = float(os.getenv("SOCIAL_SIZE_CUT_PCT", "30"))     # -30% when conflicting
 
 
+# Open/closed for each hour of the week, indexed by weekday() * 24 + hour
+_OPEN_HOURS = np.ones(7 * 24, dtype=bool)
+_OPEN_HOURS[4 * 24 + 22:5 * 24] = False   # Friday from 22:00 UTC
+_OPEN_HOURS[5 * 24:6 * 24] = False        # Saturday
+_OPEN_HOURS[6 * 24:6 * 24 + 22] = False   # Sunday until 22:00 UTC
+_OPEN_HOURS_LIST = _OPEN_HOURS.tolist()
+
+_NS_PER_HOUR = 3_600_000_000_000
+# 1970-01-01 was a Thursday (weekday 3)
+_EPOCH_WEEK_HOUR = 3 * 24
+
+
 def _is_forex_market_open(now_utc: datetime) -> bool:
     """
     Returns True if the forex market is open.
@@ -26,33 +45,83 @@ def _is_forex_market_open(now_utc: datetime) -> bool:
 
     weekday(): Mon=0 … Sun=6
     """
-    wd = now_utc.weekday()
-    hour = now_utc.hour
-
-    # Saturday: always closed
-    if wd == 5:
-        return False
+    return _OPEN_HOURS_LIST[now_utc.weekday() * 24 + now_utc.hour]
 
-    # Sunday: closed until 22:00 UTC
-    if wd == 6 and hour < 22:
-        return False
 
-    # Friday: closed after 22:00 UTC
-    if wd == 4 and hour >= 22:
-        return False
-
-    return True
+def _is_open_vec(timestamps_ns: Any) -> np.ndarray:
+    """
+    _is_forex_market_open for an array of UTC epoch nanoseconds (or
+    datetime64 values), e.g. every candle of a backtest.
+    """
+    ts = np.asarray(timestamps_ns)
+    if ts.dtype.kind == "M":
+        ts = ts.astype("datetime64[ns]").view(np.int64)
+    week_hour = (ts // _NS_PER_HOUR + _EPOCH_WEEK_HOUR) % (7 * 24)
+    return _OPEN_HOURS[week_hour]
 
+from candle_series import Candle, CandleSeries, timestamps_to_datetime64
 from trend_momentum_strategy import (
     MarketDataInterface,
-    Candle,
     Signal,
     generate_signals,
     Symbol,
 )
 
+# Per-symbol sizing constants. The unit caps themselves are run_tick
+# arguments, so a spec only says which cap applies.
+SymbolSpec = namedtuple("SymbolSpec", "is_metal")
+_DEFAULT_SYMBOL_SPEC = SymbolSpec(False)
+SYMBOL_META: Mapping[str, SymbolSpec] = MappingProxyType({
+    "XAUUSD": SymbolSpec(True),
+})
+
 SYMBOL_COOLDOWN_SECONDS = 300  # 5 min cooldown between trades on same pair
-_last_order_time: Dict[str, float] = {}
+_COOLDOWN_NS = SYMBOL_COOLDOWN_SECONDS * 1_000_000_000
+_last_order_time: Dict[str, int] = {}  # symbol -> time.monotonic_ns() of last order
+
+
+# OHLC responses, shared across the per-tick MyMarket/broker instances of
+# one data source: a broker's API ``base_url`` (so practice and live never
+# mix) or, for brokers without one, the broker instance itself.
+# Brokers only return completed candles, so a fetch stays valid until the
+# next candle can close. 4H candles open on whole hours but not on 4-hour
+# multiples of the epoch (OANDA aligns them to 17:00 New York), so buckets
+# are capped at an hour.
+_OHLC_CACHE: "OrderedDict[tuple, Any]" = OrderedDict()
+_OHLC_CACHE_SIZE = 64
+_OHLC_BUCKET_SECONDS = {"4H": 3600, "1H": 3600, "5M": 300}
+# A fetch this soon after a bucket opens may not see the candle that just
+# closed yet, so it is not reused
+_OHLC_SETTLE_SECONDS = 5.0
+
+
+def _get_ohlc_cached(client: "BrokerClient", symbol: str, timeframe: str, limit: int) -> Any:
+    """
+    client.get_ohlc(...), reused while no new candle can have closed.
+    Empty results (fetch errors) are not cached.
+    """
+    bucket_seconds = _OHLC_BUCKET_SECONDS.get(timeframe)
+    if bucket_seconds is None:
+        return client.get_ohlc(symbol, timeframe=timeframe, limit=limit)
+
+    now = _time.time()
+    bucket, offset = divmod(now, bucket_seconds)
+    base_url = getattr(client, "base_url", None)
+    source = base_url if base_url is not None else id(client)
+    key = (type(client), source, symbol, timeframe, limit, bucket)
+    entry = _OHLC_CACHE.get(key)
+    if entry is not None:
+        _OHLC_CACHE.move_to_end(key)
+        return entry[1]
+
+    raw = client.get_ohlc(symbol, timeframe=timeframe, limit=limit)
+    if len(raw) and offset >= _OHLC_SETTLE_SECONDS:
+        # An id()-keyed entry holds the client so its id can't be reused
+        # by another broker while the entry exists
+        _OHLC_CACHE[key] = (client if base_url is None else None, raw)
+        if len(_OHLC_CACHE) > _OHLC_CACHE_SIZE:
+            _OHLC_CACHE.popitem(last=False)
+    return raw
 
 
 @dataclass
@@ -61,6 +130,38 @@ class Quote:
     ask: float
 
 
+@dataclass(slots=True)
+class PlanPayload:
+    """
+    An order planned by run_tick. ``response`` is filled in once the order
+    has been submitted; to_dict() gives the dashboard/API representation.
+    """
+    symbol: str
+    side: str
+    units: int
+    entry: float
+    stop_loss: float
+    take_profit: float
+    rr: float
+    comment: str
+    response: Any = None
+
+    def to_dict(self, with_response: bool = False) -> Dict[str, Any]:
+        out = {
+            "symbol": self.symbol,
+            "side": self.side,
+            "units": self.units,
+            "entry": self.entry,
+            "stop_loss": self.stop_loss,
+            "take_profit": self.take_profit,
+            "rr": self.rr,
+            "comment": self.comment,
+        }
+        if with_response:
+            out["response"] = self.response
+        return out
+
+
 class BrokerClient:
     """
     Minimal interface for a broker used by the trend momentum strategy.
@@ -68,8 +169,13 @@ class BrokerClient:
     Your concrete broker (OandaBroker in app.py) must implement:
 
       - get_ohlc(symbol, timeframe, limit) -> List[dict]
+        (a DataFrame with the same columns is also accepted)
       - get_quote(symbol) -> Quote
       - place_order(symbol, side, units, entry, stop_loss, take_profit) -> Any
+
+    run_tick may call place_order from several threads at once, one per
+    symbol, so it must not share non-thread-safe state (e.g. one
+    requests.Session) between concurrent calls.
     """
 
     def get_ohlc(self, symbol: str, timeframe: str, limit: int) -> List[dict]:
@@ -99,50 +205,128 @@ class MyMarket(MarketDataInterface):
         self.client = broker_client
 
     def get_candles(self, symbol: Symbol, timeframe: str, limit: int) -> List[Candle]:
-        raw = self.client.get_ohlc(symbol, timeframe=timeframe, limit=limit)
-        candles: List[Candle] = []
-        for r in raw:
-            candles.append(
-                Candle(
-                    timestamp=r["timestamp"],
-                    open=float(r["open"]),
-                    high=float(r["high"]),
-                    low=float(r["low"]),
-                    close=float(r["close"]),
+        raw = _get_ohlc_cached(self.client, symbol, timeframe, limit)
+        if isinstance(raw, pd.DataFrame):
+            # Column-wise extraction instead of per-row dict lookups
+            return [
+                Candle(t, o, h, l, c)
+                for t, o, h, l, c in zip(
+                    raw["timestamp"].tolist(),
+                    raw["open"].to_numpy(dtype=np.float64).tolist(),
+                    raw["high"].to_numpy(dtype=np.float64).tolist(),
+                    raw["low"].to_numpy(dtype=np.float64).tolist(),
+                    raw["close"].to_numpy(dtype=np.float64).tolist(),
                 )
+            ]
+        return [
+            Candle(
+                timestamp=r["timestamp"],
+                open=float(r["open"]),
+                high=float(r["high"]),
+                low=float(r["low"]),
+                close=float(r["close"]),
             )
-        return candles
+            for r in raw
+        ]
+
+    def get_candle_series(self, symbol: Symbol, timeframe: str, limit: int) -> CandleSeries:
+        """
+        Same candles as get_candles, as a struct of arrays, built without
+        per-row Candle objects.
+        """
+        raw = _get_ohlc_cached(self.client, symbol, timeframe, limit)
+        if isinstance(raw, pd.DataFrame):
+            ts = pd.to_datetime(raw["timestamp"], utc=True).dt.tz_localize(None)
+            return CandleSeries(
+                timestamps=ts.to_numpy(dtype="datetime64[ns]"),
+                open=raw["open"].to_numpy(dtype=np.float64),
+                high=raw["high"].to_numpy(dtype=np.float64),
+                low=raw["low"].to_numpy(dtype=np.float64),
+                close=raw["close"].to_numpy(dtype=np.float64),
+            )
+        n = len(raw)
+        return CandleSeries(
+            timestamps=timestamps_to_datetime64([r["timestamp"] for r in raw]),
+            open=np.fromiter((r["open"] for r in raw), np.float64, n),
+            high=np.fromiter((r["high"] for r in raw), np.float64, n),
+            low=np.fromiter((r["low"] for r in raw), np.float64, n),
+            close=np.fromiter((r["close"] for r in raw), np.float64, n),
+        )
 
     def get_spread(self, symbol: Symbol) -> float:
         quote = self.client.get_quote(symbol)
         return float(quote.ask) - float(quote.bid)
 
 
-def _calc_position_size(
+def _calc_position_sizes(
     balance: float,
     risk_pct: float,
-    entry: float,
-    stop_loss: float,
-    pip_value: float,
-) -> float:
+    entries: np.ndarray,
+    stop_losses: np.ndarray,
+) -> np.ndarray:
     """
-    Position size calculator for OANDA.
+    Position sizes for OANDA, for a batch of signals in one array expression.
 
     For OANDA, 1 unit = 1 of the base currency. P&L per unit for a move
     of ``stop_distance`` in price is approximately ``stop_distance`` in the
-    quote currency.  So: units = risk_amount / stop_distance.
+    quote currency.  So: units = risk_amount / |entry - stop_loss|, and 0.0
+    where the stop distance is zero.
 
     risk_pct is in percent (0.5 = 0.5% of balance).
-    pip_value is kept as a parameter for future per-pip-value refinement but
-    is not used in the core formula.
     """
-    risk_amount = balance * (risk_pct / 100.0)
-    stop_distance = abs(entry - stop_loss)
-    if stop_distance <= 0:
-        return 0.0
+    stop_distance = np.abs(entries - stop_losses)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sizes = balance * risk_pct * 0.01 / stop_distance
+    return np.where((stop_distance > 0.0) & (sizes > 0.0), sizes, 0.0)
+
+
+@lru_cache(maxsize=32)
+def _make_sizer(symbol: str, max_units_fx: int, max_units_xau: int) -> Callable[[float], int]:
+    """
+    Position size -> whole units for one symbol, with its unit cap resolved
+    once. Cached per (symbol, caps), which rarely change between ticks.
+    """
+    spec = SYMBOL_META.get(symbol, _DEFAULT_SYMBOL_SPEC)
+    max_units = max_units_xau if spec.is_metal else max_units_fx
+
+    def sizer(size: float) -> int:
+        units = int(size)
+        return units if units < max_units else max_units
 
-    size = risk_amount / stop_distance
-    return max(size, 0.0)
+    return sizer
+
+
+def _submit_order(broker_client: BrokerClient, plan: PlanPayload) -> PlanPayload:
+    """
+    Place one planned order and record the broker response on it.
+    Starts the symbol cooldown whether the order succeeds or fails.
+    """
+    try:
+        plan.response = broker_client.place_order(
+            symbol=plan.symbol,
+            side=plan.side,
+            units=plan.units,
+            entry=plan.entry,
+            stop_loss=plan.stop_loss,
+            take_profit=plan.take_profit,
+        )
+        logger.info(
+            "Momentum: order sent for %s, response=%s",
+            plan.symbol, plan.response,
+        )
+    except Exception as e:
+        plan.response = {"status": "error", "detail": str(e)}
+        logger.exception(
+            "Momentum: ERROR placing order for %s", plan.symbol,
+        )
+    # Set cooldown on failure too so we don't spam rejected orders
+    _last_order_time[plan.symbol] = _time.monotonic_ns()
+    return plan
+
+
+def _empty_result(timestamp: str) -> Dict[str, Any]:
+    """run_tick result for a tick that produced no signals."""
+    return {"timestamp": timestamp, "signals": [], "planned_orders": [], "orders": []}
 
 
 def run_tick(
@@ -176,25 +360,37 @@ def run_tick(
           "orders":  [ {...}, ... ],
         }
     """
-    market = MyMarket(broker_client)
     now = datetime.now(timezone.utc)
+    # Formatted once; every return path of the tick reports the same timestamp
+    now_iso = now.isoformat()
 
     # --- Market hours guard ---
+    # Checked before building anything else; weekend ticks do nothing
     if not _is_forex_market_open(now):
         logger.info("Momentum: forex market is closed (weekend), skipping tick.")
-        return {"timestamp": now.isoformat(), "signals": [], "planned_orders": [], "orders": []}
+        return _empty_result(now_iso)
 
-    signals: List[Signal] = generate_signals(market, now)
+    signals: List[Signal] = generate_signals(MyMarket(broker_client), now)
 
     if not signals:
         logger.info("Momentum: no signals.")
-        return {"timestamp": now.isoformat(), "signals": [], "planned_orders": [], "orders": []}
+        return _empty_result(now_iso)
 
     signals_out: List[Dict[str, Any]] = []
-    orders_out: List[Dict[str, Any]] = []
-    planned_out: List[Dict[str, Any]] = []
-
-    for sig in signals:
+    orders_out: List[PlanPayload] = []
+    planned_out: List[PlanPayload] = []
+    pending_orders: List[PlanPayload] = []
+
+    # Base position size for every signal at once; social adjustments and
+    # caps are applied per signal below
+    base_sizes = _calc_position_sizes(
+        float(balance),
+        float(risk_pct_per_trade),
+        np.fromiter((s.entry for s in signals), np.float64, len(signals)),
+        np.fromiter((s.stop_loss for s in signals), np.float64, len(signals)),
+    ).tolist()
+
+    for sig, size in zip(signals, base_sizes):
         # --- Social Signal sentiment check ---
         social_data = social_signals.get_social_sentiment_for_pair(sig.symbol)
         social_sentiment = None
@@ -237,10 +433,10 @@ def run_tick(
                     {
                         "symbol": sig.symbol,
                         "side": sig.side,
-                        "entry": float(sig.entry),
-                        "stop_loss": float(sig.stop_loss),
-                        "take_profit": float(sig.take_profit),
-                        "rr": float(sig.rr),
+                        "entry": sig.entry,
+                        "stop_loss": sig.stop_loss,
+                        "take_profit": sig.take_profit,
+                        "rr": sig.rr,
                         "comment": sig.comment,
                         "social_blocked": True,
                         "social_sentiment": social_sentiment,
@@ -259,10 +455,10 @@ def run_tick(
             {
                 "symbol": sig.symbol,
                 "side": sig.side,
-                "entry": float(sig.entry),
-                "stop_loss": float(sig.stop_loss),
-                "take_profit": float(sig.take_profit),
-                "rr": float(sig.rr),
+                "entry": sig.entry,
+                "stop_loss": sig.stop_loss,
+                "take_profit": sig.take_profit,
+                "rr": sig.rr,
                 "comment": sig.comment,
                 "social_sentiment": social_sentiment,
                 "social_confidence": social_confidence,
@@ -270,22 +466,6 @@ def run_tick(
             }
         )
 
-        # --- Position sizing ---
-        if sig.symbol == "XAUUSD":
-            pip_factor = 0.01
-            max_units = max_units_xau
-        else:
-            pip_factor = 0.0001
-            max_units = max_units_fx
-
-        size = _calc_position_size(
-            balance=balance,
-            risk_pct=risk_pct_per_trade,
-            entry=sig.entry,
-            stop_loss=sig.stop_loss,
-            pip_value=pip_factor,
-        )
-
         # --- Social signal position size adjustment ---
         if social_alignment == "aligned" and social_confidence >= 0.5:
             boost = 1.0 + (_SOCIAL_SIZE_BOOST_PCT / 100.0)
@@ -302,21 +482,23 @@ def run_tick(
                 sig.symbol, _SOCIAL_SIZE_CUT_PCT, social_confidence,
             )
 
-        units = int(size)
+        # --- Position sizing ---
+        units = _make_sizer(sig.symbol, max_units_fx, max_units_xau)(size)
         if units <= 0:
             logger.info("Momentum: size <= 0 for %s, skip order.", sig.symbol)
             continue
 
-        if units > max_units:
-            units = max_units
-
         # --- Duplicate / cooldown guard ---
-        now_ts = _time.monotonic()
-        last_ts = _last_order_time.get(sig.symbol, 0.0)
-        if now_ts - last_ts < SYMBOL_COOLDOWN_SECONDS:
+        # Cooldowns are only stamped when the batch below is submitted, so a
+        # symbol already queued this tick is treated as in cooldown too
+        if any(p.symbol == sig.symbol for p in pending_orders):
+            logger.info("Momentum: %s already has an order this tick, skip.", sig.symbol)
+            continue
+        elapsed_ns = _time.monotonic_ns() - _last_order_time.get(sig.symbol, 0)
+        if elapsed_ns < _COOLDOWN_NS:
             logger.info(
                 "Momentum: %s still in cooldown (%ds remaining), skip.",
-                sig.symbol, int(SYMBOL_COOLDOWN_SECONDS - (now_ts - last_ts)),
+                sig.symbol, (_COOLDOWN_NS - elapsed_ns) // 1_000_000_000,
             )
             continue
 
@@ -331,17 +513,17 @@ def run_tick(
             signed_units, sig.symbol, risk_pct_per_trade,
         )
 
-        plan_payload = {
-            "symbol": sig.symbol,
-            "side": sig.side,
-            "units": signed_units,
-            "entry": float(sig.entry),
-            "stop_loss": float(sig.stop_loss),
-            "take_profit": float(sig.take_profit),
-            "rr": float(sig.rr),
-            "comment": sig.comment,
-        }
-        planned_out.append(plan_payload)
+        plan = PlanPayload(
+            symbol=sig.symbol,
+            side=sig.side,
+            units=signed_units,
+            entry=sig.entry,
+            stop_loss=sig.stop_loss,
+            take_profit=sig.take_profit,
+            rr=sig.rr,
+            comment=sig.comment,
+        )
+        planned_out.append(plan)
 
         # --- FIFO: check for existing same-direction trade ---
         if execute_trades and hasattr(broker_client, "has_same_direction_trade"):
@@ -356,50 +538,30 @@ def run_tick(
             except Exception as e:
                 logger.warning("Momentum: FIFO check failed for %s: %s", sig.symbol, e)
 
-        order_resp: Any = None
         if execute_trades:
-            try:
-                order_resp = broker_client.place_order(
-                    symbol=sig.symbol,
-                    side=sig.side,
-                    units=signed_units,
-                    entry=float(sig.entry),
-                    stop_loss=float(sig.stop_loss),
-                    take_profit=float(sig.take_profit),
-                )
-                logger.info(
-                    "Momentum: order sent for %s, response=%s",
-                    sig.symbol, order_resp,
-                )
-                _last_order_time[sig.symbol] = _time.monotonic()
-                orders_out.append(
-                    {
-                        **plan_payload,
-                        "response": order_resp,
-                    }
-                )
-            except Exception as e:
-                order_resp = {"status": "error", "detail": str(e)}
-                logger.exception(
-                    "Momentum: ERROR placing order for %s", sig.symbol,
-                )
-                # Set cooldown on failure too so we don't spam rejected orders
-                _last_order_time[sig.symbol] = _time.monotonic()
-                orders_out.append(
-                    {
-                        **plan_payload,
-                        "response": order_resp,
-                    }
-                )
+            pending_orders.append(plan)
         else:
             logger.info(
                 "Momentum: execute_trades=False, order NOT sent for %s.",
                 sig.symbol,
             )
 
+    # --- Order submission ---
+    # Each order is a blocking HTTPS round-trip on a different instrument, so
+    # submit them concurrently; results keep the signal order. This assumes
+    # place_order is safe to call from several threads for different symbols
+    # (see BrokerClient); the guard above keeps one order per symbol a tick.
+    if len(pending_orders) == 1:
+        orders_out.append(_submit_order(broker_client, pending_orders[0]))
+    elif pending_orders:
+        with ThreadPoolExecutor(max_workers=len(pending_orders)) as pool:
+            orders_out.extend(
+                pool.map(lambda p: _submit_order(broker_client, p), pending_orders)
+            )
+
     return {
-        "timestamp": now.isoformat(),
+        "timestamp": now_iso,
         "signals": signals_out,
-        "planned_orders": planned_out,
-        "orders": orders_out,
+        "planned_orders": [p.to_dict() for p in planned_out],
+        "orders": [p.to_dict(with_response=True) for p in orders_out],
     }
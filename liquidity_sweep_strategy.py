@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List, Literal, Dict, Optional
+from typing import Any, Callable, List, Literal, Dict, NamedTuple, Optional, Tuple, Union
 from datetime import datetime, time
 
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from candle_series import Candle, CandleSeries, timestamps_to_datetime64
+from numba_compat import NUMBA_AVAILABLE, njit
+
 
 Symbol = Literal["EURGBP", "XAUUSD", "GBPCAD"]
+_SYMBOLS: tuple[Symbol, ...] = ("EURGBP", "XAUUSD", "GBPCAD")
+# Pairs that also need the 1H bias to agree with 4H (XAUUSD trusts 4H alone)
+_ALIGN_SYMBOLS: frozenset[Symbol] = frozenset({"EURGBP", "GBPCAD"})
 Side = Literal["long", "short"]
 
 PIP_FACTOR: Dict[str, float] = {
@@ -15,16 +25,14 @@ PIP_FACTOR: Dict[str, float] = {
 }
 
 
-@dataclass
-class Candle:
-    timestamp: datetime
-    open: float
-    high: float
-    low: float
-    close: float
+Candles = Union[List[Candle], CandleSeries]
+
 
+def _as_series(candles: Candles) -> CandleSeries:
+    return candles if isinstance(candles, CandleSeries) else CandleSeries.from_candles(candles)
 
-@dataclass
+
+@dataclass(slots=True)
 class Signal:
     symbol: Symbol
     side: Side
@@ -36,8 +44,7 @@ class Signal:
     comment: str = ""
 
 
-@dataclass
-class LiquiditySweepConfig:
+class LiquiditySweepConfig(NamedTuple):
     max_spread: float          # in pips or points, depending what you feed in
     min_wick_ratio: float      # wick / total range
     rr_default: float
@@ -79,6 +86,30 @@ PAIR_CONFIG: Dict[Symbol, LiquiditySweepConfig] = {
 }
 
 
+class _SymbolParams(NamedTuple):
+    """Per-symbol constants derived once from PAIR_CONFIG and PIP_FACTOR."""
+    cfg: LiquiditySweepConfig
+    pip_f: float
+    max_spread_price: float  # cfg.max_spread converted to a raw price spread
+    sl_buffer: float         # 5 pips / 5 points beyond the sweep wick
+    min_sl_distance: float
+
+
+def _symbol_params(symbol: Symbol) -> _SymbolParams:
+    cfg = PAIR_CONFIG[symbol]
+    pip_f = PIP_FACTOR.get(symbol, 0.0001)
+    return _SymbolParams(
+        cfg=cfg,
+        pip_f=pip_f,
+        max_spread_price=cfg.max_spread * pip_f,
+        sl_buffer=5.0 * pip_f,
+        min_sl_distance=cfg.min_sl_pips * pip_f,
+    )
+
+
+_SYMBOL_PARAMS: Dict[Symbol, _SymbolParams] = {s: _symbol_params(s) for s in PAIR_CONFIG}
+
+
 # --- Utility helpers -------------------------------------------------------
 
 def _get_last_n(candles: List[Candle], n: int) -> List[Candle]:
@@ -101,26 +132,76 @@ def _is_down_trend(swings: List[Candle]) -> bool:
     return highs[2] < highs[1] < highs[0]
 
 
-def _find_swings(candles: List[Candle], lookback: int = 2) -> Dict[str, List[Candle]]:
-    """Detects swing highs and lows using a basic fractal concept."""
-    swing_highs: List[Candle] = []
-    swing_lows: List[Candle] = []
-
-    n = len(candles)
+def _swing_indices_np(
+    highs: np.ndarray, lows: np.ndarray, lookback: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Swing high/low indices via sliding-window max/min (needs lookback >= 1)."""
+    n = highs.shape[0]
+    # Extremes of every ``lookback``-wide window; for the candle at i the left
+    # neighbours are window i - lookback and the right ones window i + 1
+    window_max = sliding_window_view(highs, lookback).max(axis=1)
+    window_min = sliding_window_view(lows, lookback).min(axis=1)
+    centre = slice(lookback, n - lookback)
+    left = slice(0, n - 2 * lookback)
+    right = slice(lookback + 1, n - lookback + 1)
+
+    is_high = (highs[centre] > window_max[left]) & (highs[centre] > window_max[right])
+    is_low = (lows[centre] < window_min[left]) & (lows[centre] < window_min[right])
+    return np.flatnonzero(is_high) + lookback, np.flatnonzero(is_low) + lookback
+
+
+@njit(cache=True, nogil=True)
+def _find_swings_jit(
+    highs: np.ndarray, lows: np.ndarray, lookback: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Same result as _swing_indices_np as a plain loop, for numba."""
+    n = highs.shape[0]
+    is_high = np.zeros(n, dtype=np.bool_)
+    is_low = np.zeros(n, dtype=np.bool_)
     for i in range(lookback, n - lookback):
-        c = candles[i]
-        left = candles[i - lookback : i]
-        right = candles[i + 1 : i + 1 + lookback]
+        high = highs[i]
+        low = lows[i]
+        high_ok = True
+        low_ok = True
+        # Nearest neighbours first: most candles fail at k=1, so stop as soon
+        # as neither side can still be a swing
+        for k in range(1, lookback + 1):
+            if high_ok and not (high > highs[i - k] and high > highs[i + k]):
+                high_ok = False
+            if low_ok and not (low < lows[i - k] and low < lows[i + k]):
+                low_ok = False
+            if not (high_ok or low_ok):
+                break
+        is_high[i] = high_ok
+        is_low[i] = low_ok
+    return np.flatnonzero(is_high), np.flatnonzero(is_low)
+
+
+def _find_swings(candles: Candles, lookback: int = 2) -> Dict[str, List[Candle]]:
+    """
+    Detects swing highs and lows using a basic fractal concept: a candle
+    whose high (low) is strictly above (below) those of the ``lookback``
+    candles on each side.
+    """
+    series = _as_series(candles)
+    n = len(series)
+    if n < 2 * lookback + 1:
+        return {"highs": [], "lows": []}
+    if lookback <= 0:
+        return {"highs": list(series.to_candles()), "lows": list(series.to_candles())}
 
-        if all(c.high > x.high for x in left + right):
-            swing_highs.append(c)
-        if all(c.low < x.low for x in left + right):
-            swing_lows.append(c)
+    # The compiled loop beats the window reductions on these short series;
+    # without numba it would be a Python loop, so use NumPy instead
+    find = _find_swings_jit if NUMBA_AVAILABLE else _swing_indices_np
+    high_idx, low_idx = find(series.high, series.low, lookback)
 
-    return {"highs": swing_highs, "lows": swing_lows}
+    return {
+        "highs": [series.candle(i) for i in high_idx.tolist()],
+        "lows": [series.candle(i) for i in low_idx.tolist()],
+    }
 
 
-def _compute_bias_4h(candles_4h: List[Candle]) -> str:
+def _compute_bias_4h(candles_4h: Candles) -> str:
     """Returns 'bullish', 'bearish', or 'range' based on 4H structure."""
     if len(candles_4h) < 20:
         return "range"
@@ -139,7 +220,7 @@ def _compute_bias_4h(candles_4h: List[Candle]) -> str:
     return "range"
 
 
-def _compute_bias_1h(candles_1h: List[Candle]) -> str:
+def _compute_bias_1h(candles_1h: Candles) -> str:
     """Same logic as 4H but for 1H."""
     if len(candles_1h) < 20:
         return "range"
@@ -160,91 +241,94 @@ def _compute_bias_1h(candles_1h: List[Candle]) -> str:
 
 # --- Liquidity levels (previous day high/low & equal highs/lows) -----------
 
-@dataclass
+@dataclass(slots=True)
 class LiquidityLevel:
     price: float
     kind: Literal["PDH", "PDL", "EQH", "EQL"]
 
 
-def _previous_day_high_low(candles_5m: List[Candle]) -> Optional[tuple[float, float]]:
-    if not candles_5m:
-        return None
+_NS_PER_DAY = 86_400 * 10**9
 
-    # Group by date; take previous day
-    by_date: Dict[str, List[Candle]] = {}
-    for c in candles_5m:
-        d = c.timestamp.date().isoformat()
-        by_date.setdefault(d, []).append(c)
 
-    if len(by_date) < 2:
+def _previous_day_high_low(candles_5m: Candles) -> Optional[tuple[float, float]]:
+    if not len(candles_5m):
         return None
 
-    dates = sorted(by_date.keys())
-    prev_date = dates[-2]
-    day_candles = by_date[prev_date]
+    # Candles are chronological, so the last UTC day is a suffix of the series
+    # and the previous day the run right before it: two binary searches find
+    # both, and only the previous day's candles are reduced (no per-candle
+    # day bucketing of the whole window on every tick)
+    series = _as_series(candles_5m)
+    ns = series.timestamps.view(np.int64)
+    last = int(ns[-1])
+    end = int(np.searchsorted(ns, last - last % _NS_PER_DAY))
+    if end == 0:
+        return None
+    prev = int(ns[end - 1])
+    start = int(np.searchsorted(ns[:end], prev - prev % _NS_PER_DAY))
 
-    high = max(c.high for c in day_candles)
-    low = min(c.low for c in day_candles)
+    high = float(series.high[start:end].max())
+    low = float(series.low[start:end].min())
     return high, low
 
 
 def _equal_levels(
-    candles_5m: List[Candle],
+    candles_5m: Candles,
     threshold_ratio: float = 0.15,  # tightened back to reduce false levels
 ) -> List[LiquidityLevel]:
     """Find very rough equal highs/lows using an ATR-ish tolerance."""
     if len(candles_5m) < 10:
         return []
 
-    highs = [c.high for c in candles_5m]
-    lows = [c.low for c in candles_5m]
-    avg_range = sum(h - l for h, l in zip(highs, lows)) / len(highs)
+    series = _as_series(candles_5m)
+    highs = series.high
+    lows = series.low
+    avg_range = float(series.ranges().mean())
     if avg_range <= 0:
         return []
 
     tol = avg_range * threshold_ratio
-    levels: List[LiquidityLevel] = []
-
-    # group highs
-    for i in range(1, len(highs)):
-        if abs(highs[i] - highs[i - 1]) <= tol:
-            levels.append(
-                LiquidityLevel(price=(highs[i] + highs[i - 1]) / 2.0, kind="EQH")
-            )
-
-    # group lows
-    for i in range(1, len(lows)):
-        if abs(lows[i] - lows[i - 1]) <= tol:
-            levels.append(
-                LiquidityLevel(price=(lows[i] + lows[i - 1]) / 2.0, kind="EQL")
-            )
 
-    return levels
-
-
-def _build_liquidity_levels(candles_5m: List[Candle]) -> List[LiquidityLevel]:
-    levels: List[LiquidityLevel] = []
-    pd = _previous_day_high_low(candles_5m)
+    # Adjacent pairs within tolerance, midpoint of each pair as the level.
+    # Highs and lows share one pre-sized (2, n - 1) buffer per quantity
+    # (row 0 EQH, row 1 EQL) instead of a temporary per operation.
+    n = len(series)
+    mids = np.empty((2, n - 1))
+    gaps = np.empty((2, n - 1))
+    np.add(highs[1:], highs[:-1], out=mids[0])
+    np.add(lows[1:], lows[:-1], out=mids[1])
+    np.subtract(highs[1:], highs[:-1], out=gaps[0])
+    np.subtract(lows[1:], lows[:-1], out=gaps[1])
+    near = np.abs(gaps, out=gaps) <= tol
+    mids *= 0.5
+
+    return [LiquidityLevel(price=p, kind="EQH") for p in mids[0][near[0]].tolist()] + [
+        LiquidityLevel(price=p, kind="EQL") for p in mids[1][near[1]].tolist()
+    ]
+
+
+def _build_liquidity_levels(candles_5m: Candles) -> List[LiquidityLevel]:
+    series = _as_series(candles_5m)
+    levels = _equal_levels(series)
+    pd = _previous_day_high_low(series)
     if pd:
         pdh, pdl = pd
-        levels.append(LiquidityLevel(price=pdh, kind="PDH"))
-        levels.append(LiquidityLevel(price=pdl, kind="PDL"))
-
-    levels.extend(_equal_levels(candles_5m))
+        levels[:0] = (LiquidityLevel(price=pdh, kind="PDH"), LiquidityLevel(price=pdl, kind="PDL"))
     return levels
 
 
 # --- Sweep & BOS detection -------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class SweepResult:
     candle: Candle
     level: LiquidityLevel
     side: Side  # side of potential trade (opposite of the sweep direction)
+    idx: int = -1  # position of ``candle`` in the scanned series, -1 if unknown
 
 
 def _detect_sweep(
-    candles_5m: List[Candle],
+    candles_5m: Candles,
     levels: List[LiquidityLevel],
     bias: str,
     cfg: LiquiditySweepConfig,
@@ -262,39 +346,55 @@ def _detect_sweep(
     if not candles_5m or not levels:
         return None
 
+    series = _as_series(candles_5m)
     best: Optional[SweepResult] = None
-    n = len(candles_5m)
+    n = len(series)
     window = min(scan_window, n)
+    start = n - window
+    upper_ratios, lower_ratios = series.wick_ratios()
+    upper_ratios = upper_ratios[start:].tolist()
+    lower_ratios = lower_ratios[start:].tolist()
+    highs = series.high[start:].tolist()
+    lows = series.low[start:].tolist()
+    closes = series.close[start:].tolist()
+
+    # Levels sorted by price, so the ones inside a candle's sweep range are a
+    # contiguous run found by binary search. When several match, the level
+    # listed last wins (largest original index), as with a linear scan.
+    prices = np.fromiter((level.price for level in levels), np.float64, len(levels))
+    order = np.argsort(prices, kind="stable")
+    sorted_prices = prices[order]
 
     for offset in range(window):
-        idx = n - 1 - offset
-        candle = candles_5m[idx]
-        rng = candle.high - candle.low
-        if rng <= 0:
-            continue
-
-        upper_wick = candle.high - max(candle.open, candle.close)
-        lower_wick = min(candle.open, candle.close) - candle.low
-        upper_ratio = upper_wick / rng
-        lower_ratio = lower_wick / rng
-
-        # For bullish bias we want a sweep BELOW (grab liquidity then go up)
-        if bias == "bullish" and lower_ratio >= cfg.min_wick_ratio:
-            for level in levels:
-                if candle.low < level.price <= candle.close:
-                    best = SweepResult(candle=candle, level=level, side="long")
-
-        # For bearish bias we want a sweep ABOVE
-        if bias == "bearish" and upper_ratio >= cfg.min_wick_ratio:
-            for level in levels:
-                if candle.high > level.price >= candle.close:
-                    best = SweepResult(candle=candle, level=level, side="short")
+        j = window - 1 - offset
+        high, low, close = highs[j], lows[j], closes[j]
+
+        # For bullish bias we want a sweep BELOW (grab liquidity then go up):
+        # low < level <= close
+        if bias == "bullish" and lower_ratios[j] >= cfg.min_wick_ratio:
+            lo = np.searchsorted(sorted_prices, low, side="right")
+            hi = np.searchsorted(sorted_prices, close, side="right")
+            if lo < hi:
+                best = SweepResult(
+                    candle=series.candle(start + j), level=levels[int(order[lo:hi].max())],
+                    side="long", idx=start + j,
+                )
+
+        # For bearish bias we want a sweep ABOVE: close <= level < high
+        if bias == "bearish" and upper_ratios[j] >= cfg.min_wick_ratio:
+            lo = np.searchsorted(sorted_prices, close, side="left")
+            hi = np.searchsorted(sorted_prices, high, side="left")
+            if lo < hi:
+                best = SweepResult(
+                    candle=series.candle(start + j), level=levels[int(order[lo:hi].max())],
+                    side="short", idx=start + j,
+                )
 
     return best
 
 
 def _confirm_bos(
-    candles_5m: List[Candle],
+    candles_5m: Candles,
     sweep: SweepResult,
 ) -> bool:
     """
@@ -307,32 +407,31 @@ def _confirm_bos(
     if len(candles_5m) < 10:
         return False
 
-    # find index of sweep candle
-    try:
-        idx = next(i for i, c in enumerate(candles_5m) if c.timestamp == sweep.candle.timestamp)
-    except StopIteration:
-        return False
+    series = _as_series(candles_5m)
+
+    # index of the sweep candle; _detect_sweep records it, otherwise look it up
+    idx = sweep.idx
+    if idx < 0:
+        matches = np.flatnonzero(
+            series.timestamps == timestamps_to_datetime64([sweep.candle.timestamp])[0]
+        )
+        if matches.size == 0:
+            return False
+        idx = int(matches[0])
 
     # look back a few bars before sweep to define a minor structure level
-    lookback = candles_5m[max(0, idx - 5) : idx]  # increased back to 5 for stronger BOS
+    lookback_start = max(0, idx - 5)  # increased back to 5 for stronger BOS
+    if lookback_start == idx:
+        return False
+    after = series.close[idx + 1 :]
 
     if sweep.side == "long":
-        if not lookback:
-            return False
-        minor_high = max(c.high for c in lookback)
-        for c in candles_5m[idx + 1 :]:
-            # require close-based break for stronger confirmation
-            if c.close > minor_high:
-                return True
-    else:  # short
-        if not lookback:
-            return False
-        minor_low = min(c.low for c in lookback)
-        for c in candles_5m[idx + 1 :]:
-            if c.close < minor_low:
-                return True
-
-    return False
+        minor_high = series.high[lookback_start:idx].max()
+        # require close-based break for stronger confirmation
+        return bool((after > minor_high).any())
+    # short
+    minor_low = series.low[lookback_start:idx].min()
+    return bool((after < minor_low).any())
 
 
 # --- RR selection & SL/TP calculation -------------------------------------
@@ -383,6 +482,35 @@ def _calc_sl_tp(
     return sl, tp
 
 
+# --- Per-series result caches ---------------------------------------------
+
+# Bias and liquidity levels are pure functions of a candle series, which only
+# changes when a new candle closes, so ticks in between reuse them.
+_BIAS_CACHE: "OrderedDict[tuple, str]" = OrderedDict()
+_LEVELS_CACHE: "OrderedDict[tuple, List[LiquidityLevel]]" = OrderedDict()
+_CACHE_SIZE = 16
+
+
+def _series_key(symbol: Symbol, timeframe: str, candles: CandleSeries) -> tuple:
+    ts = candles.timestamps
+    return (
+        symbol, timeframe, len(candles),
+        int(ts[0].astype("int64")), int(ts[-1].astype("int64")), float(candles.close[-1]),
+    )
+
+
+def _cached(cache: OrderedDict, key: tuple, compute: Callable[[], Any]) -> Any:
+    """LRU lookup in ``cache``, filling a miss with ``compute()``."""
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+    value = compute()
+    cache[key] = value
+    if len(cache) > _CACHE_SIZE:
+        cache.popitem(last=False)
+    return value
+
+
 # --- Public API: generate_signals -----------------------------------------
 
 class MarketDataInterface:
@@ -394,100 +522,185 @@ class MarketDataInterface:
     def get_candles(self, symbol: Symbol, timeframe: str, limit: int) -> List[Candle]:
         raise NotImplementedError
 
+    def get_candle_series(self, symbol: Symbol, timeframe: str, limit: int) -> CandleSeries:
+        """Columnar candles; override to build the arrays without Candle objects."""
+        return CandleSeries.from_candles(self.get_candles(symbol, timeframe, limit))
+
+    def get_candles_multi(
+        self, requests: List[Tuple[Symbol, str, int]]
+    ) -> Dict[Tuple[Symbol, str], List[Candle]]:
+        """
+        Candles for several (symbol, timeframe, limit) requests, keyed by
+        (symbol, timeframe). Override with the broker's batch endpoint; the
+        default makes one get_candles call per request. generate_signals
+        only batches its fetches when this or get_candle_series_multi is
+        overridden.
+        """
+        return {(symbol, tf): self.get_candles(symbol, tf, limit) for symbol, tf, limit in requests}
+
+    def get_candle_series_multi(
+        self, requests: List[Tuple[Symbol, str, int]]
+    ) -> Dict[Tuple[Symbol, str], CandleSeries]:
+        """
+        Columnar get_candles_multi. By default it converts an overridden
+        get_candles_multi, or makes one get_candle_series call per request.
+        """
+        if _overrides(self, "get_candles_multi"):
+            return {
+                key: CandleSeries.from_candles(candles)
+                for key, candles in self.get_candles_multi(requests).items()
+            }
+        return {
+            (symbol, tf): self.get_candle_series(symbol, tf, limit)
+            for symbol, tf, limit in requests
+        }
+
     def get_spread(self, symbol: Symbol) -> float:
         raise NotImplementedError
 
 
-def generate_signals(market: MarketDataInterface, now_utc: datetime) -> List[Signal]:
-    """
-    Main strategy entrypoint.
+def _overrides(market: MarketDataInterface, name: str) -> bool:
+    """True when ``market``'s class provides its own MarketDataInterface.<name>."""
+    return getattr(type(market), name, None) not in (None, getattr(MarketDataInterface, name))
 
-    - Computes 4H and 1H bias
-    - Confirms pair-specific rules
-    - Checks 5M liquidity sweep + BOS
-    - Returns a list of Signal objects (0, 1, or more)
+
+_CANDLE_LIMITS: Dict[str, int] = {"4H": 150, "1H": 150, "5M": 200}
+
+# Everything a batching market is asked for in one call: 4H and 5M for every
+# symbol, 1H only for the pairs that check 1H alignment
+_CANDLE_REQUESTS: List[Tuple[Symbol, str, int]] = [
+    (symbol, tf, limit)
+    for symbol in _SYMBOLS
+    for tf, limit in _CANDLE_LIMITS.items()
+    if tf != "1H" or symbol in _ALIGN_SYMBOLS
+]
+
+
+def _process_symbol(
+    symbol: Symbol,
+    raw_spread: float,
+    fetch: Callable[[str], CandleSeries],
+) -> Optional[Signal]:
     """
-    signals: List[Signal] = []
+    The bias/sweep/BOS pipeline for one symbol whose spread passed the
+    filter. ``fetch(timeframe)`` returns its candles; each timeframe is
+    only fetched once the checks before it pass.
+    """
+    params = _SYMBOL_PARAMS[symbol]
+    cfg = params.cfg
 
-    for symbol in ("EURGBP", "XAUUSD", "GBPCAD"):
-        cfg = PAIR_CONFIG[symbol]
+    # --- HTF bias ---
+    candles_4h = fetch("4H")
+    if len(candles_4h) < 30:
+        return None
+    bias_4h = _cached(
+        _BIAS_CACHE, _series_key(symbol, "4H", candles_4h),
+        lambda: _compute_bias_4h(candles_4h),
+    )
+    if bias_4h == "range":
+        # For all three pairs we skip range conditions
+        return None
+    bias = bias_4h
 
-        # --- Spread filter (convert raw spread to pips) ---
-        raw_spread = market.get_spread(symbol)
-        pip_f = PIP_FACTOR.get(symbol, 0.0001)
-        spread_in_pips = raw_spread / pip_f if pip_f > 0 else float("inf")
-        if spread_in_pips > cfg.max_spread:
-            continue
+    # Pair-specific alignment logic
+    if symbol in _ALIGN_SYMBOLS:
+        candles_1h = fetch("1H")
+        if len(candles_1h) < 30:
+            return None
+        bias_1h = _cached(
+            _BIAS_CACHE, _series_key(symbol, "1H", candles_1h),
+            lambda: _compute_bias_1h(candles_1h),
+        )
+        if bias_1h != bias_4h:
+            return None
+    # XAUUSD: trust 4H more, ignore 1H entirely
 
-        # --- Get candles ---
-        candles_4h = market.get_candles(symbol, "4H", limit=150)
-        candles_1h = market.get_candles(symbol, "1H", limit=150)
-        candles_5m = market.get_candles(symbol, "5M", limit=200)
+    candles_5m = fetch("5M")
+    if len(candles_5m) < 50:
+        return None
 
-        if len(candles_4h) < 30 or len(candles_1h) < 30 or len(candles_5m) < 50:
-            continue
+    # --- Liquidity levels & sweep ---
+    levels = _cached(
+        _LEVELS_CACHE, _series_key(symbol, "5M", candles_5m),
+        lambda: _build_liquidity_levels(candles_5m),
+    )
+    sweep = _detect_sweep(candles_5m, levels, bias, cfg)
+    if not sweep:
+        return None
 
-        bias_4h = _compute_bias_4h(candles_4h)
-        bias_1h = _compute_bias_1h(candles_1h)
+    # --- BOS confirmation ---
+    bos_ok = _confirm_bos(candles_5m, sweep)
+    if not bos_ok:
+        return None
 
-        if bias_4h == "range":
-            # For all three pairs we skip range conditions
-            continue
+    # --- Build signal ---
+    entry = float(candles_5m.close[-1])
+    rr = _choose_rr(symbol, sweep)
+    # Add a buffer beyond the sweep wick so SL isn't right at the
+    # liquidity level.  For XAU use a wider buffer (price is ~2000).
+    sl_tp = _calc_sl_tp(
+        entry, sweep.side, sweep, rr,
+        buffer_points=params.sl_buffer,
+        min_sl_distance=params.min_sl_distance,
+    )
+
+    # Skip if SL/TP calculation failed (entry too close to sweep wick)
+    if sl_tp is None:
+        return None
+    sl, tp = sl_tp
 
-        # Pair-specific alignment logic
-        if symbol in ("EURGBP", "GBPCAD"):
-            if bias_1h != bias_4h:
-                continue
-            bias = bias_4h
-        else:  # XAUUSD: trust 4H more, ignore 1H conflict
-            bias = bias_4h
-
-        # --- Liquidity levels & sweep ---
-        levels = _build_liquidity_levels(candles_5m)
-        sweep = _detect_sweep(candles_5m, levels, bias, cfg)
-        if not sweep:
-            continue
+    # Final validation: SL distance must be > 3x raw spread to avoid
+    # being stopped out by spread fluctuations alone
+    sl_distance = abs(entry - sl)
+    if sl_distance < 3.0 * raw_spread:
+        return None
 
-        # --- BOS confirmation ---
-        bos_ok = _confirm_bos(candles_5m, sweep)
-        if not bos_ok:
-            continue
+    return Signal(
+        symbol=symbol,
+        side=sweep.side,
+        entry=entry,
+        stop_loss=sl,
+        take_profit=tp,
+        rr=rr,
+        comment=f"HTF {bias.upper()} + 5M liquidity sweep ({sweep.level.kind}) + BOS",
+    )
 
-        # --- Build signal ---
-        last = candles_5m[-1]
-        entry = last.close
-        rr = _choose_rr(symbol, sweep)
-        # Add a buffer beyond the sweep wick so SL isn't right at the
-        # liquidity level.  For XAU use a wider buffer (price is ~2000).
-        pip_f = PIP_FACTOR.get(symbol, 0.0001)
-        buffer = 5.0 * pip_f  # 5 pips / 5 points buffer (was 3)
-        min_sl_distance = cfg.min_sl_pips * pip_f
-        sl_tp = _calc_sl_tp(
-            entry, sweep.side, sweep, rr,
-            buffer_points=buffer,
-            min_sl_distance=min_sl_distance,
-        )
 
-        # Skip if SL/TP calculation failed (entry too close to sweep wick)
-        if sl_tp is None:
-            continue
-        sl, tp = sl_tp
+def generate_signals(market: MarketDataInterface, now_utc: datetime) -> List[Signal]:
+    """
+    Main strategy entrypoint.
 
-        # Final validation: SL distance must be > 3x raw spread to avoid
-        # being stopped out by spread fluctuations alone
-        sl_distance = abs(entry - sl)
-        if sl_distance < 3.0 * raw_spread:
+    - Computes 4H and 1H bias
+    - Confirms pair-specific rules
+    - Checks 5M liquidity sweep + BOS
+    - Returns a list of Signal objects (0, 1, or more)
+    """
+    # --- Spread filter (max spread in pips, compared as a raw price spread) ---
+    # Needs no candles, so it runs before any candle fetch
+    spreads: Dict[Symbol, float] = {}
+    for symbol in _SYMBOLS:
+        raw_spread = market.get_spread(symbol)
+        if raw_spread > _SYMBOL_PARAMS[symbol].max_spread_price:
             continue
+        spreads[symbol] = raw_spread
 
-        sig = Signal(
-            symbol=symbol,
-            side=sweep.side,
-            entry=entry,
-            stop_loss=sl,
-            take_profit=tp,
-            rr=rr,
-            comment=f"HTF {bias.upper()} + 5M liquidity sweep ({sweep.level.kind}) + BOS",
+    if _overrides(market, "get_candle_series_multi") or _overrides(market, "get_candles_multi"):
+        # One batch call for the remaining symbols' candles instead of a
+        # round trip each
+        candles = market.get_candle_series_multi(
+            [req for req in _CANDLE_REQUESTS if req[0] in spreads]
         )
-        signals.append(sig)
 
+        def fetcher(symbol: Symbol) -> Callable[[str], CandleSeries]:
+            return lambda tf: candles[symbol, tf]
+    else:
+        # No batch endpoint: fetch per timeframe so failed checks skip the rest
+        def fetcher(symbol: Symbol) -> Callable[[str], CandleSeries]:
+            return lambda tf: market.get_candle_series(symbol, tf, limit=_CANDLE_LIMITS[tf])
+
+    signals: List[Signal] = []
+    for symbol, raw_spread in spreads.items():
+        sig = _process_symbol(symbol, raw_spread, fetcher(symbol))
+        if sig is not None:
+            signals.append(sig)
     return signals
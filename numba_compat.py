@@ -0,0 +1,22 @@
+"""
+Optional Numba support.
+
+``njit`` compiles with numba when it is installed and is a pass-through
+decorator otherwise, so kernels still run as plain Python/NumPy without it.
+"""
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
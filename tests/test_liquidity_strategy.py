@@ -10,6 +10,7 @@ import pytest
 
 from liquidity_sweep_strategy import (
     Candle,
+    CandleSeries,
     Signal,
     MarketDataInterface,
     Symbol,
@@ -121,6 +122,41 @@ class TestSpreadFilter:
         assert isinstance(signals, list)
 
 
+class TestBatchedCandles:
+    def test_generate_signals_fetches_candles_in_one_batch(self):
+        calls = []
+
+        class BatchMarket(StubMarket):
+            def get_candle_series_multi(self, requests):
+                calls.append(list(requests))
+                return super().get_candle_series_multi(requests)
+
+        market = BatchMarket(spread=0.00015)
+        generate_signals(market, datetime.now(timezone.utc))
+
+        assert len(calls) == 1
+        fetched = {(symbol, tf) for symbol, tf, _ in calls[0]}
+        assert ("XAUUSD", "1H") not in fetched
+        assert {("EURGBP", "1H"), ("GBPCAD", "1H"), ("XAUUSD", "4H"), ("XAUUSD", "5M")} <= fetched
+
+    def test_unbatched_market_fetches_lazily(self):
+        calls = []
+
+        class CountingMarket(StubMarket):
+            def get_candles(self, symbol, timeframe, limit):
+                calls.append((symbol, timeframe))
+                return super().get_candles(symbol, timeframe, limit)
+
+        # Too few 4H candles: nothing past the 4H fetch is requested
+        generate_signals(CountingMarket(spread=0.00015), datetime.now(timezone.utc))
+        assert sorted(calls) == [("EURGBP", "4H"), ("GBPCAD", "4H"), ("XAUUSD", "4H")]
+
+        # Spread filter runs before any candle fetch
+        calls.clear()
+        generate_signals(CountingMarket(spread=1000.0), datetime.now(timezone.utc))
+        assert calls == []
+
+
 # ---------------------------------------------------------------------------
 # Swing detection tests
 # ---------------------------------------------------------------------------
@@ -154,6 +190,34 @@ class TestSwingDetection:
         assert _is_down_trend(high_candles) is True
 
 
+class TestCandleSeries:
+    def test_series_matches_candle_list(self):
+        candles = _make_candles(1.1000, 60)
+        series = CandleSeries.from_candles(candles)
+
+        assert len(series) == 60
+        assert series.high.tolist() == [c.high for c in candles]
+        swings_list = _find_swings(candles, lookback=2)
+        swings_series = _find_swings(series, lookback=2)
+        assert swings_series["highs"] == swings_list["highs"]
+        assert swings_series["lows"] == swings_list["lows"]
+
+    def test_candle_rebuilt_from_arrays(self):
+        candles = _make_candles(1.1000, 3)
+        series = CandleSeries.from_candles(candles)
+        series.candles = None
+
+        assert series.candle(1) == candles[1]
+
+    def test_timestamps_naive_and_string_are_utc(self):
+        from candle_series import timestamps_to_datetime64
+
+        aware = datetime(2025, 6, 1, 10, 0, tzinfo=timezone(timedelta(hours=2)))
+        expected = timestamps_to_datetime64([aware])
+        assert timestamps_to_datetime64([datetime(2025, 6, 1, 8, 0)]) == expected
+        assert timestamps_to_datetime64(["2025-06-01T08:00:00.000000000Z"]) == expected
+
+
 # ---------------------------------------------------------------------------
 # SL / TP calculation tests
 # ---------------------------------------------------------------------------
@@ -216,45 +280,56 @@ class TestSlTpCalc:
 
 class TestPositionSizing:
     def test_fx_position_sizing_reasonable(self):
-        from forexbot_core import _calc_position_size
+        import numpy as np
+        from forexbot_core import _calc_position_sizes
 
-        size = _calc_position_size(
+        (size,) = _calc_position_sizes(
             balance=10_000,
             risk_pct=0.5,
-            entry=1.0800,
-            stop_loss=1.0785,
-            pip_value=0.0001,
+            entries=np.array([1.0800]),
+            stop_losses=np.array([1.0785]),
         )
         # risk = 50, stop_distance = 0.0015
         # units = 50 / 0.0015 = 33_333
         assert 30_000 < size < 40_000
 
     def test_xau_position_sizing_reasonable(self):
-        from forexbot_core import _calc_position_size
+        import numpy as np
+        from forexbot_core import _calc_position_sizes
 
-        size = _calc_position_size(
+        (size,) = _calc_position_sizes(
             balance=10_000,
             risk_pct=0.5,
-            entry=2000.00,
-            stop_loss=1998.00,
-            pip_value=0.01,
+            entries=np.array([2000.00]),
+            stop_losses=np.array([1998.00]),
         )
         # risk = 50, stop_distance = 2.0
         # units = 50 / 2.0 = 25
         assert 20 < size < 30
 
     def test_zero_stop_distance_returns_zero(self):
-        from forexbot_core import _calc_position_size
+        import numpy as np
+        from forexbot_core import _calc_position_sizes
 
-        size = _calc_position_size(
+        (size,) = _calc_position_sizes(
             balance=10_000,
             risk_pct=0.5,
-            entry=1.0800,
-            stop_loss=1.0800,
-            pip_value=0.0001,
+            entries=np.array([1.0800]),
+            stop_losses=np.array([1.0800]),
         )
         assert size == 0.0
 
+    def test_batch_sizing_per_signal(self):
+        import numpy as np
+        from forexbot_core import _calc_position_sizes
+
+        # Long, long, zero-distance and short (stop above entry) signals
+        entries = np.array([1.0800, 2000.00, 1.0800, 0.8600])
+        stops = np.array([1.0785, 1998.00, 1.0800, 0.8625])
+        sizes = _calc_position_sizes(10_000, 0.5, entries, stops)
+        expected = [50 / abs(e - s) if e != s else 0.0 for e, s in zip(entries, stops)]
+        assert sizes == pytest.approx(expected)
+
 
 # ---------------------------------------------------------------------------
 # ChaosEngine risk tests
@@ -300,6 +375,65 @@ class TestChaosRisk:
         # drawdown = 0.02 < 0.03
         assert exceeded is False
 
+    def test_portfolio_risk_skips_malformed_trades(self):
+        from chaosfx.risk import compute_portfolio_risk
+
+        trades = [
+            {"currentUnits": "-1000", "price": "1.1000", "stopLossOrder": {"price": "1.1050"}},
+            {"currentUnits": "2000", "price": "1.2000"},  # no SL -> zero risk
+            {"currentUnits": "oops", "price": "1.3000"},
+        ]
+        risk = compute_portfolio_risk(trades, equity=10_000)
+        # 1000 * 0.0050 = 5 -> 5 / 10000
+        assert abs(risk - 0.0005) < 1e-9
+
+    def test_currency_exposure_nets_by_currency(self):
+        from chaosfx.risk import compute_currency_exposure
+
+        trades = [
+            {"instrument": "EUR_USD", "currentUnits": "1000"},
+            {"instrument": "USD_JPY", "currentUnits": "-400"},
+            {"instrument": "FOO_BAR", "currentUnits": "999"},
+        ]
+        exposure = compute_currency_exposure(trades)
+        assert exposure == {"EUR": 1000.0, "JPY": 400.0, "USD": -1400.0}
+        assert compute_currency_exposure([]) == {}
+
+    def test_currency_exposure_ignores_price_fields(self):
+        from chaosfx.risk import compute_currency_exposure
+
+        trades = [{"instrument": "EUR_USD", "currentUnits": "1000", "stopLossOrder": {"price": None}}]
+        assert compute_currency_exposure(trades) == {"EUR": 1000.0, "USD": -1000.0}
+
+    @pytest.mark.parametrize("bad_units", ["oops", None])
+    def test_malformed_units(self, bad_units):
+        from chaosfx.risk import compute_currency_exposure, compute_portfolio_risk
+
+        good = {"instrument": "EUR_USD", "currentUnits": "1000", "price": "1.1000",
+                "stopLossOrder": {"price": "1.0900"}, "unrealizedPL": None}
+        bad = {"instrument": "GBP_USD", "currentUnits": bad_units, "price": "1.3000",
+               "stopLossOrder": {"price": "1.2900"}}
+
+        # Portfolio risk skips the malformed trade, exposure refuses to guess
+        assert compute_portfolio_risk([good, bad], 10_000) == pytest.approx(0.001)
+        with pytest.raises((ValueError, TypeError)):
+            compute_currency_exposure([good, bad])
+
+    def test_r_multiple_batch_matches_scalar(self):
+        import numpy as np
+        from chaosfx.risk import compute_r_multiple, compute_r_multiple_batch
+
+        entry = np.array([1.1000, 1.1000, 150.00, 1.2000])
+        sl = np.array([1.0950, 1.1050, 149.50, 1.2000])
+        exit_ = np.array([1.1100, 1.0900, 149.50, 1.2100])
+        is_long = np.array([True, False, True, True])
+
+        batch = compute_r_multiple_batch(entry, sl, exit_, is_long)
+        for i in range(len(entry)):
+            side = "LONG" if is_long[i] else "SHORT"
+            assert batch[i] == pytest.approx(compute_r_multiple(entry[i], sl[i], exit_[i], side))
+        assert batch[3] == 0.0  # zero risk
+
 
 # ---------------------------------------------------------------------------
 # ChaosEngine strategy pip_factor tests
@@ -332,3 +466,273 @@ class TestCooldownGuard:
 
         assert isinstance(_last_order_time, dict)
         assert SYMBOL_COOLDOWN_SECONDS > 0
+
+    def test_multiple_orders_submitted_once_per_symbol(self, monkeypatch):
+        import threading
+
+        import forexbot_core
+        import social_signals
+        from forexbot_core import BrokerClient, run_tick
+        from trend_momentum_strategy import Signal as MomentumSignal
+
+        signals = [
+            MomentumSignal("EURGBP", "long", 0.8600, 0.8585, 0.8630, 2.0),
+            MomentumSignal("XAUUSD", "short", 2000.0, 2004.0, 1992.0, 2.0),
+            MomentumSignal("EURGBP", "short", 0.8600, 0.8615, 0.8570, 2.0),
+            MomentumSignal("GBPCAD", "long", 1.7200, 1.7180, 1.7240, 2.0),
+        ]
+
+        class RecordingBroker(BrokerClient):
+            def __init__(self):
+                self.calls = []
+                self.lock = threading.Lock()
+
+            def place_order(self, symbol, side, units, entry, stop_loss, take_profit):
+                with self.lock:
+                    self.calls.append((symbol, side, threading.get_ident()))
+                return {"status": "ok", "symbol": symbol}
+
+        monkeypatch.setattr(forexbot_core, "_is_forex_market_open", lambda now: True)
+        monkeypatch.setattr(forexbot_core, "generate_signals", lambda market, now: signals)
+        monkeypatch.setattr(social_signals, "get_social_sentiment_for_pair", lambda symbol: None)
+        monkeypatch.setattr(forexbot_core, "_last_order_time", {})
+
+        broker = RecordingBroker()
+        result = run_tick(broker, balance=10_000, execute_trades=True)
+
+        # The second EURGBP signal is skipped, not sent alongside the first
+        assert sorted((symbol, side) for symbol, side, _ in broker.calls) == [
+            ("EURGBP", "long"), ("GBPCAD", "long"), ("XAUUSD", "short"),
+        ]
+        assert threading.get_ident() not in {thread for _, _, thread in broker.calls}
+        # Results keep signal order whatever order the calls ran in
+        assert [o["symbol"] for o in result["orders"]] == ["EURGBP", "XAUUSD", "GBPCAD"]
+        assert [o["response"]["symbol"] for o in result["orders"]] == ["EURGBP", "XAUUSD", "GBPCAD"]
+        assert set(forexbot_core._last_order_time) == {"EURGBP", "XAUUSD", "GBPCAD"}
+
+
+class TestMarketHours:
+    def test_vectorized_matches_scalar(self):
+        from datetime import datetime, timedelta, timezone
+
+        import numpy as np
+        from forexbot_core import _is_forex_market_open, _is_open_vec
+
+        start = datetime(2025, 1, 3, 20, tzinfo=timezone.utc)  # Friday
+        times = [start + timedelta(hours=i) for i in range(60)]
+        ns = np.array([int(t.timestamp()) * 10**9 for t in times])
+        expected = [_is_forex_market_open(t) for t in times]
+        assert _is_open_vec(ns).tolist() == expected
+        assert expected[:2] == [True, True] and not expected[2]  # closes 22:00 Fri
+        assert expected[50] and not expected[49]                 # opens 22:00 Sun
+
+
+class TestOhlcCache:
+    def test_fetch_reused_within_bucket(self, monkeypatch):
+        import forexbot_core
+        from forexbot_core import BrokerClient, MyMarket
+
+        class CountingBroker(BrokerClient):
+            calls = 0
+
+            def __init__(self, base_url):
+                self.base_url = base_url
+
+            def get_ohlc(self, symbol, timeframe, limit):
+                CountingBroker.calls += 1
+                return [{"timestamp": "2025-01-01T00:00:00+00:00",
+                         "open": 1.0, "high": 1.1, "low": 0.9, "close": 1.05}]
+
+        practice = "https://api-fxpractice.oanda.com/v3"
+        forexbot_core._OHLC_CACHE.clear()
+        monkeypatch.setattr(forexbot_core._time, "time", lambda: 3600.0 * 1000 + 60.0)
+        MyMarket(CountingBroker(practice)).get_candles("EURGBP", "5M", limit=1)
+        candles = MyMarket(CountingBroker(practice)).get_candles("EURGBP", "5M", limit=1)
+        assert CountingBroker.calls == 1
+        assert candles[0].close == 1.05
+
+        # Another data source never sees practice candles
+        MyMarket(CountingBroker("https://api-fxtrade.oanda.com/v3")).get_candles(
+            "EURGBP", "5M", limit=1
+        )
+        assert CountingBroker.calls == 2
+
+        # Next 5M bucket: a new candle may have closed
+        monkeypatch.setattr(forexbot_core._time, "time", lambda: 3600.0 * 1000 + 360.0)
+        MyMarket(CountingBroker(practice)).get_candles("EURGBP", "5M", limit=1)
+        assert CountingBroker.calls == 3
+        forexbot_core._OHLC_CACHE.clear()
+
+    def test_brokers_without_base_url_are_cached_per_instance(self, monkeypatch):
+        import forexbot_core
+        from forexbot_core import BrokerClient, MyMarket
+
+        class FixedBroker(BrokerClient):
+            def __init__(self, close):
+                self.close = close
+
+            def get_ohlc(self, symbol, timeframe, limit):
+                return [{"timestamp": "2025-01-01T00:00:00+00:00",
+                         "open": 1.0, "high": 2.0, "low": 0.5, "close": self.close}]
+
+        forexbot_core._OHLC_CACHE.clear()
+        monkeypatch.setattr(forexbot_core._time, "time", lambda: 3600.0 * 1000 + 60.0)
+        for close in (1.1, 1.2, 1.3):
+            candles = MyMarket(FixedBroker(close)).get_candles("EURGBP", "5M", limit=1)
+            assert candles[0].close == close
+        forexbot_core._OHLC_CACHE.clear()
+
+
+class TestStringTimestamps:
+    def test_iso_string_timestamps_give_same_signals(self):
+        import random
+
+        import forexbot_core
+        from forexbot_core import BrokerClient, MyMarket, Quote
+        from trend_momentum_strategy import generate_signals as momentum_signals
+
+        class SeededBroker(BrokerClient):
+            def __init__(self, as_str):
+                self.as_str = as_str
+
+            def get_ohlc(self, symbol, timeframe, limit):
+                rng = random.Random(f"3-{symbol}-{timeframe}")
+                price = 2000.0 if symbol == "XAUUSD" else 1.1
+                drift = rng.uniform(-1, 1) * price * 0.002
+                start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+                rows = []
+                for i in range(limit):
+                    o = price
+                    c = o + drift + rng.gauss(0, price * 0.002)
+                    ts = start + timedelta(minutes=5 * i)
+                    rows.append({
+                        "timestamp": ts.isoformat() if self.as_str else ts,
+                        "open": o,
+                        "high": max(o, c) + abs(rng.gauss(0, price * 0.001)),
+                        "low": min(o, c) - abs(rng.gauss(0, price * 0.001)),
+                        "close": c,
+                    })
+                    price = c
+                return rows
+
+            def get_quote(self, symbol):
+                return Quote(1.0, 1.0)
+
+        now = datetime.now(timezone.utc)
+        forexbot_core._OHLC_CACHE.clear()
+        expected = momentum_signals(MyMarket(SeededBroker(as_str=False)), now)
+        forexbot_core._OHLC_CACHE.clear()
+        signals = momentum_signals(MyMarket(SeededBroker(as_str=True)), now)
+        forexbot_core._OHLC_CACHE.clear()
+
+        assert expected
+        assert signals == expected
+
+
+# ---------------------------------------------------------------------------
+# ChaosEngine feature kernel tests
+# ---------------------------------------------------------------------------
+
+class TestChaosKernels:
+    def test_compute_features_matches_pandas(self):
+        import numpy as np
+        import pandas as pd
+        from chaosfx import kernels
+
+        rng = np.random.default_rng(7)
+        close = 1.10 + np.cumsum(rng.normal(0, 0.0005, 120))
+        open_ = np.concatenate(([close[0]], close[:-1]))
+        high = np.maximum(open_, close) + rng.uniform(0, 0.0004, 120)
+        low = np.minimum(open_, close) - rng.uniform(0, 0.0004, 120)
+
+        df = pd.DataFrame({"open": open_, "high": high, "low": low, "close": close})
+        prev_close = df["close"].shift()
+        tr = pd.concat(
+            [df["high"] - df["low"], (df["high"] - prev_close).abs(), (df["low"] - prev_close).abs()],
+            axis=1,
+        ).max(axis=1)
+        atr = tr.rolling(14).mean()
+        ma_fast = df["close"].rolling(10).mean()
+
+        feats = kernels.compute_features(open_, high, low, close)
+        assert feats[kernels.FEAT_MA_FAST] == pytest.approx(ma_fast.iloc[-1])
+        assert feats[kernels.FEAT_MA_FAST_LAG] == pytest.approx(ma_fast.iloc[-5])
+        assert feats[kernels.FEAT_MA_SLOW] == pytest.approx(df["close"].rolling(30).mean().iloc[-1])
+        assert feats[kernels.FEAT_ATR] == pytest.approx(atr.iloc[-1])
+        assert feats[kernels.FEAT_ATR_MEAN] == pytest.approx(atr.rolling(50).mean().iloc[-1])
+        assert feats[kernels.FEAT_RANGE_HIGH] == high[-22:-2].max()
+        assert feats[kernels.FEAT_RANGE_LOW] == low[-22:-2].min()
+        assert feats[kernels.FEAT_RECENT_RANGE_MEAN] == pytest.approx((high[-10:] - low[-10:]).mean())
+
+    def test_compute_features_short_history_is_nan(self):
+        import numpy as np
+        from chaosfx import kernels
+
+        prices = np.linspace(1.0, 1.1, 60)
+        feats = kernels.compute_features(prices, prices + 0.001, prices - 0.001, prices)
+        # 60 bars cannot fill 50 ATR(14) values (needs 63)
+        assert np.isnan(feats[kernels.FEAT_ATR_MEAN])
+        assert not np.isnan(feats[kernels.FEAT_ATR])
+
+    def test_eval_patterns_bullish_engulfing_breakout(self):
+        import numpy as np
+        from chaosfx import kernels
+
+        # Flat range, then a red bar engulfed by a green bar closing above it
+        open_ = np.full(30, 1.1000)
+        close = np.full(30, 1.1000)
+        open_[-2], close[-2] = 1.1004, 1.1001
+        open_[-1], close[-1] = 1.1000, 1.1020
+        high = np.maximum(open_, close) + 0.0002
+        low = np.minimum(open_, close) - 0.0002
+
+        flags = kernels.eval_patterns(
+            open_, high, low, close, kernels.compute_features(open_, high, low, close)
+        )
+        assert flags[kernels.PAT_BREAKOUT]
+        assert flags[kernels.PAT_BULL_ENGULF]
+        assert not flags[kernels.PAT_BEAR_ENGULF]
+        assert not flags[kernels.PAT_BEAR_PIN]
+
+
+# ---------------------------------------------------------------------------
+# ChaosEngine candle parsing tests
+# ---------------------------------------------------------------------------
+
+class TestChaosBars:
+    def test_bars_skip_incomplete_and_build_df_lazily(self):
+        from chaosfx.strategy import _bars_from_oanda
+
+        candles = [
+            {"time": "2024-01-01T00:00:00Z", "complete": True,
+             "mid": {"o": "1.1000", "h": "1.1010", "l": "1.0990", "c": "1.1005"}},
+            {"time": "2024-01-01T00:05:00Z", "complete": True,
+             "mid": {"o": "1.1005", "h": "1.1020", "l": "1.1000", "c": "1.1015"}},
+            {"time": "2024-01-01T00:10:00Z", "complete": False,
+             "mid": {"o": "1.1015", "h": "1.1016", "l": "1.1014", "c": "1.1015"}},
+        ]
+        bars = _bars_from_oanda(candles)
+        assert len(bars) == 2
+        assert bars.close[-1] == pytest.approx(1.1015)
+        assert bars._df is None
+
+        df = bars.df
+        assert df.index.name == "time"
+        assert list(df["high"]) == pytest.approx([1.1010, 1.1020])
+
+    def test_generate_signal_reuses_result_for_same_window(self):
+        from chaosfx.strategy import generate_signal
+
+        candles = [
+            {"time": f"2024-01-01T{i // 12:02d}:{(i % 12) * 5:02d}:00Z", "complete": True,
+             "mid": {"o": "1.1000", "h": f"{1.1010 + i * 1e-5:.5f}", "l": "1.0990", "c": "1.1005"}}
+            for i in range(80)
+        ]
+        sig1, bars1, meta1 = generate_signal("EUR_USD", candles, 15.0, 30.0)
+        sig2, bars2, meta2 = generate_signal("EUR_USD", candles, 15.0, 30.0)
+        assert sig2 is sig1 and bars2 is bars1
+        assert meta2 == meta1 and meta2 is not meta1
+
+        candles[-1] = dict(candles[-1], mid=dict(candles[-1]["mid"], c="1.1006"))
+        _, bars3, _ = generate_signal("EUR_USD", candles, 15.0, 30.0)
+        assert bars3 is not bars1
@@ -23,10 +23,13 @@ Pairs: EUR_GBP, XAU_USD, GBP_CAD (same OANDA instruments as before).
 
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import List, Literal, Dict, Optional
 from datetime import datetime
 
+from candle_series import Candle, CandleSeries
+
 
 # ---------------------------------------------------------------------------
 # Types
@@ -42,15 +45,6 @@ PIP_FACTOR: Dict[str, float] = {
 }
 
 
-@dataclass
-class Candle:
-    timestamp: datetime
-    open: float
-    high: float
-    low: float
-    close: float
-
-
 @dataclass
 class Signal:
     symbol: Symbol
@@ -180,19 +174,23 @@ def _rsi(closes: List[float], period: int = 14) -> List[float]:
     return result
 
 
-def _atr(candles: List[Candle], period: int = 14) -> List[float]:
+def _atr(candles: CandleSeries, period: int = 14) -> List[float]:
     """Compute ATR. Returns list of same length (0.0 padded)."""
     if len(candles) < 2:
         return [0.0] * len(candles)
 
-    tr_values: List[float] = [candles[0].high - candles[0].low]
-    for i in range(1, len(candles)):
-        c = candles[i]
-        prev_close = candles[i - 1].close
+    highs = candles.high.tolist()
+    lows = candles.low.tolist()
+    closes = candles.close.tolist()
+    tr_values: List[float] = [highs[0] - lows[0]]
+    for i in range(1, len(closes)):
+        high = highs[i]
+        low = lows[i]
+        prev_close = closes[i - 1]
         tr = max(
-            c.high - c.low,
-            abs(c.high - prev_close),
-            abs(c.low - prev_close),
+            high - low,
+            abs(high - prev_close),
+            abs(low - prev_close),
         )
         tr_values.append(tr)
 
@@ -212,16 +210,15 @@ def _atr(candles: List[Candle], period: int = 14) -> List[float]:
 # 4H Trend detection via EMA crossover
 # ---------------------------------------------------------------------------
 
-def _compute_trend_4h(candles_4h: List[Candle]) -> str:
+def _compute_trend_4h(closes: List[float]) -> str:
     """
     Returns 'bullish', 'bearish', or 'flat' based on 4H EMA(21) vs EMA(55).
     Requires EMA(21) to be clearly above/below EMA(55) for at least the
     last 3 candles to confirm a trend.
     """
-    if len(candles_4h) < 60:
+    if len(closes) < 60:
         return "flat"
 
-    closes = [c.close for c in candles_4h]
     ema21 = _ema(closes, 21)
     ema55 = _ema(closes, 55)
 
@@ -245,17 +242,16 @@ def _compute_trend_4h(candles_4h: List[Candle]) -> str:
 # 1H RSI momentum check
 # ---------------------------------------------------------------------------
 
-def _check_momentum_1h(candles_1h: List[Candle], trend: str, cfg: PairConfig) -> bool:
+def _check_momentum_1h(closes: List[float], trend: str, cfg: PairConfig) -> bool:
     """
     Confirm momentum on 1H using RSI(14).
     For bullish trend: RSI should be in the 'goldilocks' zone — trending but
     not overbought (e.g. 40–70).
     For bearish: RSI should be trending down but not oversold (30–60).
     """
-    if len(candles_1h) < 20:
+    if len(closes) < 20:
         return False
 
-    closes = [c.close for c in candles_1h]
     rsi_values = _rsi(closes, 14)
     current_rsi = rsi_values[-1]
 
@@ -365,7 +361,7 @@ def _is_bearish_momentum(candle: Candle) -> bool:
 
 
 def _detect_pullback_entry(
-    candles_5m: List[Candle],
+    candles_5m: CandleSeries,
     trend: str,
     cfg: PairConfig,
 ) -> Optional[Side]:
@@ -378,8 +374,7 @@ def _detect_pullback_entry(
     if len(candles_5m) < 30:
         return None
 
-    closes = [c.close for c in candles_5m]
-    ema21 = _ema(closes, 21)
+    ema21 = _ema(candles_5m.close.tolist(), 21)
     atr_values = _atr(candles_5m, 14)
 
     current_atr = atr_values[-1]
@@ -394,8 +389,8 @@ def _detect_pullback_entry(
         if idx < 1:
             break
 
-        candle = candles_5m[idx]
-        prev_candle = candles_5m[idx - 1]
+        candle = candles_5m.candle(idx)
+        prev_candle = candles_5m.candle(idx - 1)
         ema_at = ema21[idx]
 
         # How close is this candle to the EMA?
@@ -433,15 +428,14 @@ def _detect_pullback_entry(
 # Dynamic R:R selection based on trend strength
 # ---------------------------------------------------------------------------
 
-def _select_rr(candles_4h: List[Candle], cfg: PairConfig) -> float:
+def _select_rr(closes: List[float], cfg: PairConfig) -> float:
     """
     Select R:R based on trend strength.
     Stronger trend (wider EMA gap) → higher R:R target.
     """
-    if len(candles_4h) < 60:
+    if len(closes) < 60:
         return cfg.min_rr
 
-    closes = [c.close for c in candles_4h]
     ema21 = _ema(closes, 21)
     ema55 = _ema(closes, 55)
 
@@ -472,10 +466,87 @@ class MarketDataInterface:
     def get_candles(self, symbol: Symbol, timeframe: str, limit: int) -> List[Candle]:
         raise NotImplementedError
 
+    def get_candle_series(self, symbol: Symbol, timeframe: str, limit: int) -> CandleSeries:
+        """Columnar candles; override to build the arrays without Candle objects."""
+        return CandleSeries.from_candles(self.get_candles(symbol, timeframe, limit))
+
     def get_spread(self, symbol: Symbol) -> float:
         raise NotImplementedError
 
 
+# ---------------------------------------------------------------------------
+# Spread-independent setup evaluation
+# ---------------------------------------------------------------------------
+
+@dataclass(slots=True, frozen=True)
+class _Setup:
+    trend: str
+    side: Side
+    entry: float
+    stop_loss: float
+    take_profit: float
+    sl_distance: float
+    rr: float
+    atr_pips: float
+
+
+# (symbol, candle windows) -> _Setup or None. Completed candles never change,
+# so a hit is exact; ticks between candle closes skip the indicator work.
+_SETUP_CACHE: "OrderedDict[tuple, Optional[_Setup]]" = OrderedDict()
+_SETUP_CACHE_SIZE = 256
+
+
+def _evaluate_setup(
+    symbol: Symbol,
+    candles_4h: CandleSeries,
+    candles_1h: CandleSeries,
+    candles_5m: CandleSeries,
+) -> Optional[_Setup]:
+    """
+    Steps 1-5 of generate_signals: everything that depends only on candles.
+    Returns None when any filter rejects the pair.
+    """
+    cfg = PAIR_CONFIG[symbol]
+    pip_f = PIP_FACTOR.get(symbol, 0.0001)
+    closes_4h = candles_4h.close.tolist()
+
+    # --- 1. 4H Trend ---
+    trend = _compute_trend_4h(closes_4h)
+    if trend == "flat":
+        return None
+
+    # --- 2. 1H Momentum (RSI) ---
+    if not _check_momentum_1h(candles_1h.close.tolist(), trend, cfg):
+        return None
+
+    # --- 3. Volatility gate (5M ATR) ---
+    atr_values = _atr(candles_5m, 14)
+    current_atr = atr_values[-1]
+    atr_pips = current_atr / pip_f if pip_f > 0 else 0.0
+    if atr_pips < cfg.min_atr_pips:
+        return None
+
+    # --- 4. Pullback + reversal entry ---
+    entry_side = _detect_pullback_entry(candles_5m, trend, cfg)
+    if entry_side is None:
+        return None
+
+    # --- 5. Calculate SL/TP ---
+    entry = float(candles_5m.close[-1])
+    sl_distance = current_atr * cfg.atr_sl_multiplier
+    rr = _select_rr(closes_4h, cfg)
+    tp_distance = sl_distance * rr
+
+    if entry_side == "long":
+        sl = entry - sl_distance
+        tp = entry + tp_distance
+    else:
+        sl = entry + sl_distance
+        tp = entry - tp_distance
+
+    return _Setup(trend, entry_side, entry, sl, tp, sl_distance, rr, atr_pips)
+
+
 # ---------------------------------------------------------------------------
 # Public API: generate_signals
 # ---------------------------------------------------------------------------
@@ -509,64 +580,48 @@ def generate_signals(market: MarketDataInterface, now_utc: datetime) -> List[Sig
 
         # --- Get candles ---
         try:
-            candles_4h = market.get_candles(symbol, "4H", limit=100)
-            candles_1h = market.get_candles(symbol, "1H", limit=100)
-            candles_5m = market.get_candles(symbol, "5M", limit=200)
+            # Columnar, so no per-bar Candle objects are built
+            candles_4h = market.get_candle_series(symbol, "4H", limit=100)
+            candles_1h = market.get_candle_series(symbol, "1H", limit=100)
+            candles_5m = market.get_candle_series(symbol, "5M", limit=200)
         except Exception:
             continue
 
         if len(candles_4h) < 60 or len(candles_1h) < 20 or len(candles_5m) < 30:
             continue
 
-        # --- 1. 4H Trend ---
-        trend = _compute_trend_4h(candles_4h)
-        if trend == "flat":
-            continue
-
-        # --- 2. 1H Momentum (RSI) ---
-        if not _check_momentum_1h(candles_1h, trend, cfg):
-            continue
-
-        # --- 3. Volatility gate (5M ATR) ---
-        atr_values = _atr(candles_5m, 14)
-        current_atr = atr_values[-1]
-        atr_pips = current_atr / pip_f if pip_f > 0 else 0.0
-        if atr_pips < cfg.min_atr_pips:
-            continue
-
-        # --- 4. Pullback + reversal entry ---
-        entry_side = _detect_pullback_entry(candles_5m, trend, cfg)
-        if entry_side is None:
-            continue
-
-        # --- 5. Calculate SL/TP ---
-        entry = candles_5m[-1].close
-        sl_distance = current_atr * cfg.atr_sl_multiplier
-        rr = _select_rr(candles_4h, cfg)
-        tp_distance = sl_distance * rr
-
-        if entry_side == "long":
-            sl = entry - sl_distance
-            tp = entry + tp_distance
+        # --- 1-5. Trend, momentum, volatility, entry and SL/TP ---
+        # Depends only on the candles, so it is reused until a new one closes
+        key = (symbol,) + tuple(
+            (len(c), int(c.timestamps[0].astype("int64")), int(c.timestamps[-1].astype("int64")), float(c.close[-1]))
+            for c in (candles_4h, candles_1h, candles_5m)
+        )
+        if key in _SETUP_CACHE:
+            _SETUP_CACHE.move_to_end(key)
+            setup = _SETUP_CACHE[key]
         else:
-            sl = entry + sl_distance
-            tp = entry - tp_distance
+            setup = _evaluate_setup(symbol, candles_4h, candles_1h, candles_5m)
+            _SETUP_CACHE[key] = setup
+            if len(_SETUP_CACHE) > _SETUP_CACHE_SIZE:
+                _SETUP_CACHE.popitem(last=False)
+        if setup is None:
+            continue
 
         # Final safety: SL distance must be > 2x spread
-        if sl_distance < 2.0 * raw_spread:
+        if setup.sl_distance < 2.0 * raw_spread:
             continue
 
         sig = Signal(
             symbol=symbol,
-            side=entry_side,
-            entry=entry,
-            stop_loss=sl,
-            take_profit=tp,
-            rr=rr,
+            side=setup.side,
+            entry=setup.entry,
+            stop_loss=setup.stop_loss,
+            take_profit=setup.take_profit,
+            rr=setup.rr,
             comment=(
-                f"4H {trend.upper()} trend (EMA21>EMA55) + "
+                f"4H {setup.trend.upper()} trend (EMA21>EMA55) + "
                 f"1H RSI momentum + 5M pullback reversal | "
-                f"ATR={atr_pips:.1f}pip SL={sl_distance/pip_f:.1f}pip"
+                f"ATR={setup.atr_pips:.1f}pip SL={setup.sl_distance/pip_f:.1f}pip"
             ),
         )
         signals.append(sig)